@@ -18,6 +18,8 @@
 # (bootstrap + permutation). No GPU; predictions already exist. The stage is
 # GUARDED: if its prediction/reference inputs are not present it skips cleanly
 # (exit 0). Each analyze pass also writes sensitivity_<ruler>.csv (DIR/DPD sweep).
+# --cell-cache reuses every (ruler, grouping, score) cell whose inputs are
+# unchanged since a previous run, so re-running a stage only computes new cells.
 
 set -euo pipefail
 
@@ -35,8 +37,11 @@ source .env
 RAW="${nnUNet_raw}"
 RES="${nnUNet_results}"
 MAP="${RAW}/Dataset001_CSpineSeg/case_id_mapping.json"
-METRICS="dice hd95 ndsc"
+METRICS="dice hd95 ndsc instances"
 WORKERS=24
+# Bootstrap whole patients (all of their exams) so the CIs of the multi-exam
+# patients stay valid; see src/fairness/README.md.
+RESAMPLE=cluster
 
 # Common input locations.
 D1_PP="${RES}/Dataset001_CSpineSeg/predictions_test_pp"
@@ -60,10 +65,25 @@ require_paths () {
     return ${missing}
 }
 
-# Run evaluate only if the per-case CSV is missing (metrics are unchanged).
+# Return 0 only if the CSV exists and its header has a column for every metric
+# in METRICS (checked on the vertebral-body label; instances via inst_dice_vb).
+has_metrics () {
+    local csv="$1" header m col
+    [[ -f "${csv}" ]] || return 1
+    header=",$(head -n 1 "${csv}"),"
+    for m in ${METRICS}; do
+        col="${m}_vb"
+        [[ "${m}" == instances ]] && col="inst_dice_vb"
+        [[ "${header}" == *",${col},"* ]] || return 1
+    done
+}
+
+# Run evaluate unless the per-case CSV already has every metric in METRICS, so a
+# CSV written before a metric was added is recomputed instead of reused.
+# --resume picks up the <csv>.parts/ checkpoint of a run killed at the -W limit.
 ensure_eval () {
     local out="$1" preds="$2" refs="$3"
-    if [[ -f "${out}" ]]; then
+    if has_metrics "${out}"; then
         echo "  reuse existing ${out}"
     else
         echo "  evaluate -> ${out}"
@@ -73,7 +93,8 @@ ensure_eval () {
             --mapping     "${MAP}" \
             --output      "${out}" \
             --metrics ${METRICS} \
-            --workers ${WORKERS}
+            --workers ${WORKERS} \
+            --resume
     fi
 }
 
@@ -86,7 +107,10 @@ global)
         --evaluation-csvs outputs/eval_global.csv \
         --ruler-labels    global \
         --mapping         "${MAP}" \
-        --report-name     fairness_global
+        --report-name     fairness_global \
+        --workers         ${WORKERS} \
+        --resample        ${RESAMPLE} \
+        --cell-cache
     ;;
 
 biased_ruler)
@@ -101,21 +125,41 @@ biased_ruler)
         --evaluation-csvs outputs/eval_ruler_gold.csv outputs/eval_ruler_silver.csv \
         --ruler-labels    gold silver \
         --mapping         "${MAP}" \
-        --report-name     fairness_biased_ruler
+        --report-name     fairness_biased_ruler \
+        --workers         ${WORKERS} \
+        --resample        ${RESAMPLE} \
+        --cell-cache
     ;;
 
 bias_amplification)
     echo "=== Bias amplification (mixed vs gold-trained vs silver-trained, 76 cases) ==="
     require_paths "${D1_PP}" "${D2_PP}" "${DS3_GOLD_PREDS}" "${LABELS_GOLD}" \
         || { echo "  SKIP: inputs not ready."; exit 0; }
-    ensure_eval outputs/eval_ds1_on_gold.csv "${D1_PP}"          "${LABELS_GOLD}"
-    ensure_eval outputs/eval_ds2_on_gold.csv "${D2_PP}"          "${LABELS_GOLD}"
-    ensure_eval outputs/eval_ds3_on_gold.csv "${DS3_GOLD_PREDS}" "${LABELS_GOLD}"
+    # One pass over the gold references for all three models (each reference
+    # is decoded once per case), unless every per-model CSV already has all METRICS.
+    if has_metrics outputs/eval_ds1_on_gold.csv && has_metrics outputs/eval_ds2_on_gold.csv \
+        && has_metrics outputs/eval_ds3_on_gold.csv; then
+        echo "  reuse existing outputs/eval_ds{1,2,3}_on_gold.csv"
+    else
+        echo "  evaluate -> outputs/eval_ds{1,2,3}_on_gold.csv"
+        uv run python -u -m src.fairness.evaluate \
+            --predictions "${D1_PP}" "${D2_PP}" "${DS3_GOLD_PREDS}" \
+            --model-labels ds1 ds2 ds3 \
+            --references  "${LABELS_GOLD}" \
+            --mapping     "${MAP}" \
+            --output      'outputs/eval_{model}_on_gold.csv' \
+            --metrics ${METRICS} \
+            --workers ${WORKERS} \
+            --resume
+    fi
     uv run python -u -m src.fairness.analyze \
         --evaluation-csvs outputs/eval_ds1_on_gold.csv outputs/eval_ds2_on_gold.csv outputs/eval_ds3_on_gold.csv \
         --ruler-labels    mixed gold_trained silver_trained \
         --mapping         "${MAP}" \
-        --report-name     fairness_bias_amplification
+        --report-name     fairness_bias_amplification \
+        --workers         ${WORKERS} \
+        --resample        ${RESAMPLE} \
+        --cell-cache
     ;;
 
 biased_ruler_v2)
@@ -128,7 +172,10 @@ biased_ruler_v2)
         --evaluation-csvs outputs/eval_ds2_on_gold.csv outputs/eval_ds2_vs_ds3.csv \
         --ruler-labels    gold silver \
         --mapping         "${MAP}" \
-        --report-name     fairness_biased_ruler_v2
+        --report-name     fairness_biased_ruler_v2 \
+        --workers         ${WORKERS} \
+        --resample        ${RESAMPLE} \
+        --cell-cache
     ;;
 
 *)
@@ -0,0 +1,160 @@
+"""
+Label-volume loading with an optional decoded cache shared across runs.
+
+Segmentation masks are read as uint8 straight from the NIfTI data block. With
+a cache directory, each decoded volume is also stored as an uncompressed
+``.npy`` plus a JSON with its zooms and source path, keyed on the source's
+resolved path, size, and mtime. A rewritten source gets a new key, so its old
+entry is never read again; ``prune_label_cache`` (or running this module)
+deletes such stale entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import nibabel as nib
+import numpy as np
+
+from src.utils.settings import settings
+
+
+def default_label_cache_dir() -> Path:
+    """Decoded label-volume cache location (opt-in, see load_label_volume)."""
+    return settings.processed_dir / "label_cache"
+
+
+def load_label_volume(
+    path: Path, cache_dir: Path | None = None
+) -> tuple[np.ndarray, tuple[float, ...]]:
+    """
+    Load a NIfTI segmentation as a uint8 label array, plus its voxel spacing.
+
+    Reads the voxel data at its on-disk dtype via ``dataobj`` instead of
+    ``get_fdata()``, which would materialize a float64 copy (8x the memory of a
+    uint8 label map) before the cast back to integers. uint8 files are returned
+    without any further copy.
+
+    With ``cache_dir`` set, the decoded volume is stored there as an
+    uncompressed ``.npy`` (plus a small JSON with the zooms) and later calls
+    memory-map it instead of gunzipping the NIfTI again. Entries are keyed on
+    the resolved source path, size, and mtime, so rewriting a label file
+    invalidates its entry. Cached arrays are read-only memmaps.
+
+    Raises ValueError if the header applies intensity scaling, or if the stored
+    values are not integer labels in 0..255.
+
+    Returns:
+        (data, zooms) — the label array and ``header.get_zooms()``.
+    """
+    if cache_dir is None:
+        return _decode_label_volume(path)
+
+    key = _cache_key(Path(path))
+    npy_path = cache_dir / f"{key}.npy"
+    meta_path = cache_dir / f"{key}.json"
+
+    if npy_path.exists():
+        try:
+            zooms = tuple(json.loads(meta_path.read_text())["zooms"])
+            return np.load(npy_path, mmap_mode="r"), zooms
+        except (OSError, ValueError, KeyError):
+            pass  # Partial or corrupted entry: decode and rewrite below
+
+    data, zooms = _decode_label_volume(path)
+
+    # Write-then-rename so concurrent workers never read a half-written entry.
+    # The JSON lands first: an existing .npy always has its zooms next to it.
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_meta = meta_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_meta.write_text(json.dumps({"source": str(Path(path).resolve()), "zooms": zooms}))
+    os.replace(tmp_meta, meta_path)
+    tmp_npy = npy_path.with_suffix(f".{os.getpid()}.tmp")
+    with tmp_npy.open("wb") as f:
+        np.save(f, data)
+    os.replace(tmp_npy, npy_path)
+
+    return data, zooms
+
+
+def prune_label_cache(cache_dir: Path | None = None) -> int:
+    """
+    Delete cache entries whose source label file was rewritten or removed.
+
+    An entry is stale when the source path recorded in its JSON no longer
+    exists or no longer hashes to the entry's key (size or mtime changed), or
+    when its ``.npy`` has no JSON next to it. Run it while no evaluation is
+    writing to the cache.
+
+    Returns:
+        Number of entries removed.
+    """
+    cache_dir = default_label_cache_dir() if cache_dir is None else cache_dir
+    if not cache_dir.exists():
+        return 0
+
+    removed = 0
+    for npy_path in cache_dir.glob("*.npy"):
+        meta_path = npy_path.with_suffix(".json")
+        try:
+            source = Path(json.loads(meta_path.read_text())["source"])
+            stale = not source.exists() or _cache_key(source) != npy_path.stem
+        except (OSError, ValueError, KeyError):
+            stale = True
+        if stale:
+            npy_path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def label_volume_size(path: Path) -> int:
+    """Voxel count of a NIfTI volume from its header (voxel data is not read)."""
+    return int(np.prod(nib.load(path).shape))
+
+
+def _cache_key(path: Path) -> str:
+    """Cache key from resolved path, size, and mtime (symlinked copies share it)."""
+    resolved = path.resolve()
+    st = resolved.stat()
+    raw = f"{resolved}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _decode_label_volume(path: Path) -> tuple[np.ndarray, tuple[float, ...]]:
+    """Read voxel data unscaled at the on-disk dtype and return it as uint8."""
+    img = nib.load(path)
+    proxy = img.dataobj
+
+    if nib.is_proxy(proxy):
+        slope, inter = proxy.slope, proxy.inter
+        if slope != 1.0 or inter != 0.0:
+            raise ValueError(
+                f"Label volume {path} has intensity scaling "
+                f"(scl_slope={slope}, scl_inter={inter})"
+            )
+        data = np.asanyarray(proxy.get_unscaled())
+    else:
+        data = np.asanyarray(proxy)
+
+    zooms = tuple(float(z) for z in img.header.get_zooms())
+
+    if data.dtype == np.uint8:
+        return data, zooms
+
+    if data.size and (data.min() < 0 or data.max() > 255):
+        raise ValueError(f"Label volume {path} has values outside 0..255")
+    if not np.issubdtype(data.dtype, np.integer) and not np.array_equal(
+        data, np.round(data)
+    ):
+        raise ValueError(f"Label volume {path} has non-integer voxel values")
+
+    return data.astype(np.uint8), zooms
+
+
+if __name__ == "__main__":
+    cache_dir = default_label_cache_dir()
+    print(f"Removed {prune_label_cache(cache_dir)} stale entries from {cache_dir}")
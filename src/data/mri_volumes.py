@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 import polars as pl
 import nibabel as nib
 
@@ -25,7 +27,7 @@ def extract_mri_volume_properties(force_refresh: bool = False) -> pl.DataFrame:
         - Cache file doesn't exist
         - Cache file is older than annotation_file TSV (staleness check)
     """
-    cache_path = settings.processed_dir / "volume_properties.parquet"
+    cache_path = _cache_path()
 
     # Cache staleness check
     if not force_refresh and cache_path.exists():
@@ -171,3 +173,32 @@ def load_mri_volume_properties(force_refresh: bool = False) -> pl.DataFrame:
     df = extract_mri_volume_properties(force_refresh)
     df = filter_excluded_cases(df, logger)
     return df
+
+
+def cached_total_voxels() -> dict[str, int]:
+    """
+    Header-derived voxel count per series_submitter_id, from the Parquet cache.
+
+    Only reads an existing volume_properties.parquet and never triggers an
+    extraction (the raw annotation directory may not be on the machine running
+    the evaluation). Returns an empty dict if the cache is missing or unreadable.
+    Used as a per-case cost estimate when scheduling evaluation work.
+    """
+    cache_path = _cache_path()
+    if not cache_path.exists():
+        return {}
+
+    try:
+        df = pl.read_parquet(
+            cache_path, columns=[Col.SERIES_SUBMITTER_ID, VolumeCol.TOTAL_VOXELS]
+        )
+    except Exception as e:
+        logger.warning("Cannot read volume cache", error=str(e))
+        return {}
+
+    df = df.group_by(Col.SERIES_SUBMITTER_ID).agg(pl.col(VolumeCol.TOTAL_VOXELS).max())
+    return dict(df.iter_rows())
+
+
+def _cache_path() -> Path:
+    return settings.processed_dir / "volume_properties.parquet"
@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import polars as pl
-import nibabel as nib
-import numpy as np
 from scipy.ndimage import label as nd_label
 
 from src.data.exclusions import filter_excluded_cases
+from src.data.label_volumes import default_label_cache_dir, load_label_volume
 from src.data.loader import load_annotation_filenames
 from src.data.schemas import Col, SegmentationVolumeCol, SegmentationVolumeSchema
 from src.utils.logger import get_logger
@@ -14,7 +13,9 @@ from src.utils.settings import settings
 logger = get_logger("data.segmentation_volumes")
 
 
-def extract_segmentation_volume_properties(force_refresh: bool = False) -> pl.DataFrame:
+def extract_segmentation_volume_properties(
+    force_refresh: bool = False, volume_cache: bool = False
+) -> pl.DataFrame:
     """
     Extract annotation volume properties from all segmentation masks, with Parquet caching.
 
@@ -29,8 +30,13 @@ def extract_segmentation_volume_properties(force_refresh: bool = False) -> pl.Da
         - force_refresh=True
         - Cache file doesn't exist
         - Cache file is older than annotation_file TSV (staleness check)
+
+    With volume_cache=True, decoded masks are read from / written to the shared
+    label-volume cache (see src.data.label_volumes) instead of gunzipping every
+    _SEG file again.
     """
     cache_path = settings.processed_dir / "segmentation_volumes.parquet"
+    label_cache = default_label_cache_dir() if volume_cache else None
 
     if not force_refresh and cache_path.exists():
         annotation_tsv = settings.structured_dir / "annotation_file_RSNA_20250321.tsv"
@@ -70,18 +76,16 @@ def extract_segmentation_volume_properties(force_refresh: bool = False) -> pl.Da
             continue
 
         try:
-            img = nib.load(path)
-            data = img.get_fdata().astype(np.uint8)
-            zooms = img.header.get_zooms()
+            data, zooms = load_label_volume(path, cache_dir=label_cache)
 
-            if len(img.shape) != 3:
+            if data.ndim != 3:
                 logger.warning(
                     "Unexpected shape",
                     filename=seg_filename,
-                    shape=img.shape,
+                    shape=data.shape,
                     action="skipping",
                 )
-                failed_files.append((seg_filename, f"Unexpected shape: {img.shape}"))
+                failed_files.append((seg_filename, f"Unexpected shape: {data.shape}"))
                 continue
 
             voxel_vol_mm3 = float(zooms[0]) * float(zooms[1]) * float(zooms[2])
@@ -133,9 +137,11 @@ def extract_segmentation_volume_properties(force_refresh: bool = False) -> pl.Da
     return df
 
 
-def load_segmentation_volumes(force_refresh: bool = False) -> pl.DataFrame:
+def load_segmentation_volumes(
+    force_refresh: bool = False, volume_cache: bool = False
+) -> pl.DataFrame:
     """Load segmentation volume properties, extracting if cache is stale or missing."""
-    df = extract_segmentation_volume_properties(force_refresh)
+    df = extract_segmentation_volume_properties(force_refresh, volume_cache)
     df = filter_excluded_cases(df, logger)
     return df
 
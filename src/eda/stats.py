@@ -12,8 +12,7 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
-import scikit_posthocs as sp
-from scipy import stats
+from scipy import special, stats
 
 
 def mann_whitney_result(a: Any, b: Any) -> dict:
@@ -52,15 +51,20 @@ def mann_whitney_result(a: Any, b: Any) -> dict:
     }
 
 
-def kruskal_result(groups: dict[str, Any]) -> dict:
+def kruskal_result(groups: dict[str, Any], p_adjust: str = "bonferroni") -> dict:
     """
     Kruskal-Wallis H test for three or more independent groups, with
-    Dunn's post-hoc (Bonferroni) if the omnibus test is significant.
+    Dunn's post-hoc if the omnibus test is significant.
+
+    The data are ranked once; H and the post-hoc both come from the group
+    rank sums and the tie term of that ranking (``kruskal_h``, ``dunn_pairs``).
 
     Parameters
     ----------
     groups : dict mapping group label -> array-like
         Observations per group (nulls already dropped).
+    p_adjust : str
+        Post-hoc multiplicity adjustment, "bonferroni" or "holm".
 
     Returns
     -------
@@ -69,38 +73,128 @@ def kruskal_result(groups: dict[str, Any]) -> dict:
     arrays = [np.asarray(v, dtype=float) for v in groups.values()]
     labels = list(groups.keys())
     k = len(arrays)
-    N = sum(len(a) for a in arrays)
-
-    # stats.kruskal raises ValueError when every observation across all groups
-    # is identical (e.g. silver-ruler HD95 all 0.0). Treat as no difference.
-    if np.unique(np.concatenate(arrays)).size <= 1:
+    values = np.concatenate(arrays)
+    sizes = np.array([len(a) for a in arrays], dtype=float)
+    N = values.size
+
+    ranks = stats.rankdata(values)
+    rank_sums = np.bincount(np.repeat(np.arange(k), sizes.astype(int)), weights=ranks)
+    _, t = np.unique(values, return_counts=True)
+    tie_term = float(np.sum(t.astype(float) ** 3 - t))
+
+    # Every observation identical (e.g. silver-ruler HD95 all 0.0): there are
+    # no ranks to compare. Treat as no difference.
+    if t.size <= 1:
         H, p, epsilon_sq = float("nan"), 1.0, 0.0
     else:
-        H, p = stats.kruskal(*arrays)
+        H, p = kruskal_h(rank_sums, sizes, tie_term)
         epsilon_sq = (H - k + 1) / (N - k)
 
-    posthoc_pairs: list[dict] = []
-    if p < 0.05:
-        ph = sp.posthoc_dunn(arrays, p_adjust="bonferroni")
-        # ph is a symmetric k×k DataFrame indexed 1..k
-        for i in range(k):
-            for j in range(i + 1, k):
-                posthoc_pairs.append({
-                    "pair": f"{labels[i]} vs {labels[j]}",
-                    "p": float(ph.iloc[i, j]),
-                })
-
     return {
         "test": "kruskal_wallis",
         "H": float(H),
         "p": float(p),
         "epsilon_sq": float(epsilon_sq),
-        "posthoc": posthoc_pairs,
+        "posthoc": (
+            dunn_pairs(labels, rank_sums, sizes, tie_term, p_adjust) if p < 0.05 else []
+        ),
         "medians": {label: float(np.median(a)) for label, a in zip(labels, arrays)},
         "ns": {label: int(len(a)) for label, a in zip(labels, arrays)},
     }
 
 
+def kruskal_h(
+    rank_sums: np.ndarray, sizes: np.ndarray, tie_term: float
+) -> tuple[float, float]:
+    """
+    Tie-corrected Kruskal-Wallis H and its chi-squared p-value, from a ranking.
+
+    Same formula as ``scipy.stats.kruskal``.
+
+    Parameters
+    ----------
+    rank_sums, sizes : array-like
+        Sum of the (average) ranks and number of observations per group.
+    tie_term : float
+        ``sum(t**3 - t)`` over the tie counts ``t`` of the ranked values.
+
+    Returns
+    -------
+    (H, p)
+    """
+    rank_sums = np.asarray(rank_sums, dtype=float)
+    sizes = np.asarray(sizes, dtype=float)
+    N = sizes.sum()
+    ssbn = np.sum(rank_sums**2 / sizes)
+    H = (12.0 / (N * (N + 1)) * ssbn - 3 * (N + 1)) / (1 - tie_term / (N**3 - N))
+    return H, special.chdtrc(sizes.size - 1, H)
+
+
+def dunn_pairs(
+    labels: list,
+    rank_sums: np.ndarray,
+    sizes: np.ndarray,
+    tie_term: float,
+    p_adjust: str = "bonferroni",
+) -> list[dict]:
+    """
+    Dunn's pairwise post-hoc test after Kruskal-Wallis, from the same ranking.
+
+    For groups i and j, ``z = (mean_rank_i - mean_rank_j) / se`` with
+    ``se**2 = (N(N+1)/12 - tie_term / (12(N-1))) * (1/n_i + 1/n_j)``
+    (Dunn 1964, tie correction per Glantz 2012, as in
+    ``scikit_posthocs.posthoc_dunn``). Two-sided p-values are adjusted over
+    all pairs.
+
+    Parameters
+    ----------
+    labels : list
+        Group labels, aligned with ``rank_sums`` and ``sizes``.
+    rank_sums, sizes, tie_term
+        As for ``kruskal_h``.
+    p_adjust : str
+        "bonferroni" or "holm" (step-down Bonferroni).
+
+    Returns
+    -------
+    list of dicts with keys: pair ("A vs B"), z, p (adjusted), p_raw, one per
+    unordered pair
+    """
+    rank_sums = np.asarray(rank_sums, dtype=float)
+    sizes = np.asarray(sizes, dtype=float)
+    N = sizes.sum()
+    i, j = np.triu_indices(len(labels), 1)
+    mean_ranks = rank_sums / sizes
+    variance = N * (N + 1) / 12.0 - tie_term / (12.0 * (N - 1))
+    z = (mean_ranks[i] - mean_ranks[j]) / np.sqrt(variance * (1 / sizes[i] + 1 / sizes[j]))
+    p_raw = 2.0 * special.ndtr(-np.abs(z))
+    p = _adjust_pvalues(p_raw, p_adjust)
+    return [
+        {
+            "pair": f"{labels[a]} vs {labels[b]}",
+            "z": float(z[m]),
+            "p": float(p[m]),
+            "p_raw": float(p_raw[m]),
+        }
+        for m, (a, b) in enumerate(zip(i, j))
+    ]
+
+
+def _adjust_pvalues(p: np.ndarray, method: str) -> np.ndarray:
+    """Family-wise adjusted p-values: "bonferroni" or "holm" (step-down)."""
+    m = p.size
+    if method == "bonferroni":
+        return np.minimum(p * m, 1.0)
+    if method == "holm":
+        order = np.argsort(p, kind="stable")
+        stepped = np.maximum.accumulate(p[order] * (m - np.arange(m)))
+        adjusted = np.empty(m)
+        adjusted[order] = np.minimum(stepped, 1.0)
+        return adjusted
+    msg = f"Unknown p_adjust: {method!r}. Valid: ('bonferroni', 'holm')"
+    raise ValueError(msg)
+
+
 def chi2_result(contingency: pd.DataFrame) -> dict:
     """
     Chi-squared test of independence plus Cramér's V effect size.
@@ -8,15 +8,27 @@ Usage:
         --evaluation-csvs eval_all.csv eval_gold.csv eval_silver.csv \
         --ruler-labels all gold silver \
         --mapping case_id_mapping.json \
-        [--report-name fairness]
+        [--report-name fairness] [--workers 24] [--cell-cache] [--sequential]
+        [--resample {case,stratified,cluster}]
 """
 
 from __future__ import annotations
 
 import functools
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import pickle
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
 import polars as pl
+import scipy
 
 from src.data.groups import (
     AgeStrategy,
@@ -29,20 +41,23 @@ from src.data.groups import (
 )
 from src.data.loader import load_metadata
 from src.data.schemas import Col
+from src.eda import stats as eda_stats
 from src.eda.report import EDAReport
 from src.fairness.metrics import (
     apply_fdr,
-    bootstrap_ci,
+    bootstrap_cis,
     compare_fairness_gaps,
+    dir_curve,
     dir_sensitivity,
     dir_widening,
-    disparate_impact_ratio,
     fairness_gap,
     group_summary,
     kruskal_wallis_test,
     mann_whitney_test,
     ols_regression,
-    permutation_test,
+    ols_regressions,
+    permutation_tests,
+    rank_tests,
 )
 from src.fairness.plots import (
     bootstrap_forest,
@@ -50,7 +65,10 @@ from src.fairness.plots import (
     dir_bar_chart,
     violin_by_group,
 )
+from src.fairness import metrics, resampling
+from src.fairness.resampling import RESAMPLING_SCHEMES, GroupedScores, cluster_codes
 from src.utils.logger import get_logger
+from src.utils.settings import settings
 
 logger = get_logger("fairness.analyze")
 
@@ -66,6 +84,21 @@ DEFAULT_THRESHOLDS = {"dice": 0.8, "ndsc": 0.8, "hd95": 5.0}
 DEFAULT_SWEEP_HIGHER = [0.7, 0.75, 0.8, 0.85, 0.9]  # dice, ndsc
 DEFAULT_SWEEP_HD95 = [2.0, 5.0, 10.0]  # mm
 SWEEP_SCORES = ("dice_macro", "ndsc_macro", "hd95_macro")
+# Dense grids for the DIR/DPD-vs-threshold curves (with bootstrap bands).
+CURVE_HIGHER = np.round(np.arange(0.5, 1.0 + 1e-9, 0.0025), 4)  # dice, ndsc
+CURVE_HD95 = np.round(np.arange(0.5, 20.0 + 1e-9, 0.1), 4)  # mm
+CURVE_N_BOOT = 2_000
+# Base entropy of the per-cell resampling seeds (see _cell_seeds).
+ANALYSIS_SEED = 42
+# Statistics bootstrapped / permutation-tested per (score, grouping) cell. All
+# are read off the same per-group rates, so adding one costs almost nothing.
+RESAMPLED_STATISTICS = ("dir", "dpd", "best_rate", "worst_rate", "group_rates")
+N_BOOT = 10_000
+N_PERM = 10_000
+# The cell cache key already hashes the source of _analyze_cell, _cell_seeds,
+# metrics.py, resampling.py and src.eda.stats (see _code_digest). Bump this
+# only when results change through code outside those, e.g. a dependency.
+CELL_CACHE_VERSION = 7
 
 
 def _beneficial_spec(score_col: str, thresholds: dict[str, float]) -> tuple[float, bool]:
@@ -131,24 +164,367 @@ def _apply_grouping(
     return spec.apply(df, source_col)
 
 
-def _n_groups(df: pl.DataFrame, group_col: str) -> int:
-    return df[group_col].n_unique()
+@dataclass(frozen=True, slots=True)
+class AnalysisCell:
+    """One (ruler, grouping, score) cell of the analysis grid.
+
+    Cells are independent until the per-ruler FDR pass, so they can run in
+    any process and in any order. ``data`` holds only the cell's valid scores
+    and group codes (sliced from ``RulerColumns``), which keeps pickling to
+    worker processes cheap. ``test`` is the cell's rank test if it was
+    already computed with the rest of its grouping (``RulerColumns.rank_tests``).
+    """
+
+    key: str
+    ruler: str
+    grouping: str
+    score_col: str
+    group_col: str
+    n_groups: int
+    threshold: float
+    higher_is_better: bool
+    sweep: list[float]
+    sequential: bool
+    resample: str
+    data: GroupedScores
+    test: dict | None = None
+
+
+def _cell_seeds(key: str, n: int = 3) -> list[int]:
+    """Independent seeds for one cell (bootstrap, permutation test, curve).
+
+    Derived from ``ANALYSIS_SEED`` and the cell key alone, so a cell's
+    resamples do not depend on ``--workers``, on scheduling order, or on
+    which other cells run.
+    """
+    seq = np.random.SeedSequence([ANALYSIS_SEED, zlib.crc32(key.encode())])
+    return [int(s) for s in seq.generate_state(n)]
+
+
+@dataclass(frozen=True, slots=True)
+class RulerColumns:
+    """Columnar cache of one joined ruler frame, shared by all of its cells.
+
+    Every grouping is applied once and kept as an integer group code per row
+    (-1 where ``GroupingSpec.apply`` drops the row, ``groups`` sorted with a
+    null group last); every score column is read once as a float array plus
+    its valid (non-NaN, non-null) mask. ``clusters`` are the patient codes
+    of the rows for the cluster bootstrap (None without a patient column).
+    ``cell`` slices a (score, grouping) cell out of these arrays, so adding
+    groupings or score columns adds almost no Polars work.
+    """
+
+    scores: dict[str, np.ndarray]
+    valid: dict[str, np.ndarray]
+    codes: dict[str, np.ndarray]
+    groups: dict[str, list]
+    clusters: np.ndarray | None
+
+    def cell(self, score_col: str, grouping: str) -> GroupedScores:
+        """Valid scores of ``score_col`` coded by ``grouping`` (absent groups dropped)."""
+        keep = self.valid[score_col] & (self.codes[grouping] >= 0)
+        if not keep.any():
+            msg = f"No valid scores in {score_col} for any group"
+            raise ValueError(msg)
+
+        codes = self.codes[grouping][keep]
+        groups = self.groups[grouping]
+        present = np.bincount(codes, minlength=len(groups)) > 0
+        return GroupedScores(
+            scores=self.scores[score_col][keep],
+            codes=(np.cumsum(present) - 1)[codes],
+            groups=[g for g, p in zip(groups, present) if p],
+            clusters=None if self.clusters is None else self.clusters[keep],
+            all_groups=groups,
+        )
+
+    def rank_tests(self, score_cols: list[str], grouping: str) -> dict[str, dict]:
+        """Mann-Whitney / Kruskal-Wallis of several score columns in one batched call."""
+        if not score_cols:
+            return {}
+        values = np.column_stack([self.scores[c] for c in score_cols])
+        tests = rank_tests(values, self.codes[grouping], self.groups[grouping])
+        return dict(zip(score_cols, tests))
+
+
+def _ruler_columns(df: pl.DataFrame, score_cols: list[str]) -> RulerColumns:
+    """Build the ``RulerColumns`` cache: one pass per grouping and per score column."""
+    indexed = df.with_row_index("_row")
+    codes: dict[str, np.ndarray] = {}
+    groups: dict[str, list] = {}
+    for grouping_label, spec, source_col, group_col in GROUPINGS:
+        grouped = _apply_grouping(indexed, spec, source_col)
+        values = grouped[group_col].to_list()
+        names = sorted(set(values), key=lambda v: (v is None, v))
+        index = {g: i for i, g in enumerate(names)}
+
+        row_codes = np.full(df.height, -1, dtype=np.intp)
+        row_codes[grouped["_row"].to_numpy()] = np.fromiter(
+            (index[v] for v in values), dtype=np.intp, count=len(values)
+        )
+        codes[grouping_label] = row_codes
+        groups[grouping_label] = names
+
+    scores: dict[str, np.ndarray] = {}
+    valid: dict[str, np.ndarray] = {}
+    for score_col in score_cols:
+        values = df[score_col].cast(pl.Float64).fill_null(np.nan).to_numpy()
+        scores[score_col] = values
+        valid[score_col] = ~np.isnan(values)
+
+    clusters = None
+    if Col.PATIENT_ID in df.columns:
+        clusters = cluster_codes(df[Col.PATIENT_ID])
+    return RulerColumns(
+        scores=scores, valid=valid, codes=codes, groups=groups, clusters=clusters
+    )
 
 
-def _analyze_single_ruler(
-    eval_df: pl.DataFrame,
+def _ruler_cells(
+    df: pl.DataFrame,
     ruler_label: str,
-    metadata: pl.DataFrame,
-    report: EDAReport,
     thresholds: dict[str, float],
     sweep_higher: list[float],
     sweep_hd95: list[float],
-) -> dict:
-    """Run all fairness analyses for one ruler. Returns collected stats."""
-    df = eval_df.join(metadata, on=Col.SERIES_SUBMITTER_ID, how="inner")
-    logger.info(f"Ruler '{ruler_label}': joined {df.height} cases")
+    sequential: bool = False,
+    resample: str = "case",
+) -> list[AnalysisCell]:
+    """Enumerate the (grouping x score) cells of one joined ruler frame.
 
+    Raises ValueError for ``resample="cluster"`` without a patient column.
+    """
     score_cols = _detect_score_cols(df)
+    columns = _ruler_columns(df, score_cols)
+    if resample == "cluster" and columns.clusters is None:
+        msg = f"Cluster bootstrap needs a {Col.PATIENT_ID} column (ruler '{ruler_label}')"
+        raise ValueError(msg)
+
+    cells: list[AnalysisCell] = []
+    for grouping_label, _, _, group_col in GROUPINGS:
+        ng = len(columns.groups[grouping_label])
+        if ng < 2:
+            logger.warning(f"Skipping {grouping_label}: only {ng} group(s)")
+            continue
+
+        grouping_data: dict[str, GroupedScores] = {}
+        for score_col in score_cols:
+            try:
+                grouping_data[score_col] = columns.cell(score_col, grouping_label)
+            except ValueError as e:
+                logger.warning(
+                    f"Skipping {score_col} x {grouping_label} for ruler "
+                    f"'{ruler_label}': {e}"
+                )
+
+        # One batched rank test for every score column with all groups present;
+        # the other cells run their own test, which reports the missing group.
+        tests = columns.rank_tests(
+            [c for c, data in grouping_data.items() if data.n_groups == ng],
+            grouping_label,
+        )
+        for score_col, data in grouping_data.items():
+            thr, hib = _beneficial_spec(score_col, thresholds)
+            cells.append(AnalysisCell(
+                key=f"{ruler_label}__{score_col}__{grouping_label}",
+                ruler=ruler_label,
+                grouping=grouping_label,
+                score_col=score_col,
+                group_col=group_col,
+                n_groups=ng,
+                threshold=thr,
+                higher_is_better=hib,
+                sweep=_sweep_for(score_col, sweep_higher, sweep_hd95),
+                sequential=sequential,
+                resample=resample,
+                data=data,
+                test=tests.get(score_col),
+            ))
+    return cells
+
+
+def _analyze_cell(cell: AnalysisCell) -> dict:
+    """All per-cell statistics (top-level function for pickling).
+
+    One failing (score, grouping) combination must not abort the whole
+    ruler — otherwise a single degenerate metric (e.g. silver-ruler HD95)
+    silently loses the entire silver ruler and the cross-ruler widening. The
+    error is returned and logged by the caller instead.
+    """
+    df, score_col, group_col = cell.data, cell.score_col, cell.group_col
+    thr, hib = cell.threshold, cell.higher_is_better
+    boot_seed, perm_seed, curve_seed = _cell_seeds(cell.key)
+    try:
+        result: dict = {
+            "summary": group_summary(df, score_col, group_col),
+            "gap": fairness_gap(
+                df, score_col, group_col, threshold=thr, higher_is_better=hib
+            ),
+        }
+
+        if score_col in SWEEP_SCORES:
+            result["sensitivity"] = dir_sensitivity(
+                df, score_col, group_col, cell.sweep, higher_is_better=hib
+            )
+            grid = CURVE_HD95 if score_col.startswith("hd95") else CURVE_HIGHER
+            result["curve"] = dir_curve(
+                df, score_col, group_col, grid,
+                higher_is_better=hib, n_boot=CURVE_N_BOOT, seed=curve_seed,
+            )
+
+        if cell.test is not None:
+            result["test"] = cell.test
+        elif cell.n_groups == 2:
+            result["test"] = mann_whitney_test(df, score_col, group_col)
+        else:
+            result["test"] = kruskal_wallis_test(df, score_col, group_col)
+
+        # One resample pass per cell yields CIs / p-values for all stats
+        result["cis"] = bootstrap_cis(
+            df, score_col, group_col, RESAMPLED_STATISTICS,
+            threshold=thr, higher_is_better=hib, n_boot=N_BOOT, seed=boot_seed,
+            sequential=cell.sequential, resample=cell.resample,
+        )
+        result["perms"] = permutation_tests(
+            df, score_col, group_col, RESAMPLED_STATISTICS,
+            threshold=thr, higher_is_better=hib, n_perm=N_PERM, seed=perm_seed,
+            sequential=cell.sequential,
+        )
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return result
+
+
+def default_cell_cache_dir() -> Path:
+    """Per-cell result cache location (opt-in, see run)."""
+    return settings.processed_dir / "fairness_cell_cache"
+
+
+@functools.cache
+def _code_digest() -> str:
+    """Hash of the code that computes cell results, plus NumPy/SciPy versions.
+
+    Editing ``_analyze_cell``, ``_cell_seeds``, ``metrics.py``,
+    ``resampling.py`` or ``src.eda.stats`` changes every cell digest, so the
+    cell cache never serves results from older code. The library versions
+    cover changes in the random streams and SciPy routines.
+    """
+    h = hashlib.sha1()
+    for obj in (_analyze_cell, _cell_seeds, metrics, resampling, eda_stats):
+        h.update(inspect.getsource(obj).encode())
+    h.update(f"numpy {np.__version__} scipy {scipy.__version__}".encode())
+    return h.hexdigest()
+
+
+def _cell_digest(cell: AnalysisCell) -> str:
+    """Content hash of everything a cell's results depend on.
+
+    Covers the cell's actual inputs (valid scores, group codes and names,
+    hence the evaluation CSV, the joined metadata, and the grouping spec)
+    plus its key (which seeds the resampling), threshold, sweep, resample
+    counts, mode and scheme (with the patient clusters), the code that
+    computes it (``_code_digest``), and ``CELL_CACHE_VERSION``.
+    """
+    params = {
+        "version": CELL_CACHE_VERSION,
+        "code": _code_digest(),
+        "key": cell.key,
+        "n_groups": cell.n_groups,
+        "threshold": cell.threshold,
+        "higher_is_better": cell.higher_is_better,
+        "sweep": cell.sweep,
+        "sequential": cell.sequential,
+        "resample": cell.resample,
+        "groups": cell.data.groups,
+        "all_groups": cell.data.all_groups,
+        "statistics": RESAMPLED_STATISTICS,
+        "n_boot": N_BOOT,
+        "n_perm": N_PERM,
+        "seed": ANALYSIS_SEED,
+        "curve": [CURVE_HIGHER.tolist(), CURVE_HD95.tolist(), CURVE_N_BOOT],
+    }
+    h = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode())
+    h.update(cell.data.scores.astype(np.float64).tobytes())
+    h.update(cell.data.codes.astype(np.int64).tobytes())
+    if cell.resample == "cluster":
+        h.update(cell.data.clusters.astype(np.int64).tobytes())
+    return h.hexdigest()
+
+
+def _load_cell(cache_dir: Path, digest: str) -> dict | None:
+    """Cached result of a cell, or None if absent or unreadable."""
+    path = cache_dir / f"{digest}.pkl"
+    if not path.exists():
+        return None
+    try:
+        with path.open("rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None  # Partial or corrupted entry: recompute and rewrite
+
+
+def _store_cell(cache_dir: Path, digest: str, result: dict) -> None:
+    """Write a cell result (write-then-rename, so readers never see a partial file)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{digest}.pkl"
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _run_cells(
+    cells: list[AnalysisCell], workers: int, cache_dir: Path | None = None
+) -> list[dict]:
+    """Run every cell, in parallel when workers > 1; results keep cell order.
+
+    With ``cache_dir`` set, cells whose digest is already stored there are
+    loaded instead of recomputed, and fresh successful results are stored.
+    """
+    results: list[dict | None] = [None] * len(cells)
+    digests: list[str] = []
+    if cache_dir is not None:
+        digests = [_cell_digest(cell) for cell in cells]
+        results = [_load_cell(cache_dir, digest) for digest in digests]
+    missing = [i for i, result in enumerate(results) if result is None]
+    logger.info(
+        "Analysis grid",
+        cells=len(cells), cached=len(cells) - len(missing), workers=workers,
+    )
+
+    todo = [cells[i] for i in missing]
+    if workers <= 1 or len(todo) <= 1:
+        fresh = [_analyze_cell(cell) for cell in todo]
+    else:
+        # spawn, not fork: the parent has already run multi-threaded Polars
+        # queries, and forking a process with live thread pools can deadlock.
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            fresh = list(pool.map(_analyze_cell, todo))
+
+    for i, result in zip(missing, fresh):
+        results[i] = result
+        if cache_dir is not None and "error" not in result:
+            _store_cell(cache_dir, digests[i], result)
+    return results  # type: ignore[return-value]
+
+
+def _cell_frame(cell: AnalysisCell) -> pl.DataFrame:
+    """The cell's valid scores and group labels as a two-column frame (for plots)."""
+    data = cell.data
+    return pl.DataFrame({
+        cell.score_col: data.scores,
+        cell.group_col: [data.groups[c] for c in data.codes],
+    })
+
+
+def _collect_ruler(
+    ruler_label: str,
+    df: pl.DataFrame,
+    cells: list[AnalysisCell],
+    results: list[dict],
+    report: EDAReport,
+) -> dict:
+    """Save one ruler's cell results, then run its FDR pass, plots, and OLS."""
     all_p_values: list[float] = []
     all_p_labels: list[str] = []
     ruler_stats: dict = {"ruler": ruler_label, "n_cases": df.height}
@@ -157,80 +533,52 @@ def _analyze_single_ruler(
     ci_results: list[dict] = []
     ci_labels: list[str] = []
     sensitivity_rows: list[pl.DataFrame] = []
-
-    for grouping_label, spec, source_col, group_col in GROUPINGS:
-        grouped_df = _apply_grouping(df, spec, source_col)
-        ng = _n_groups(grouped_df, group_col)
-        if ng < 2:
-            logger.warning(f"Skipping {grouping_label}: only {ng} group(s)")
+    curve_rows: list[pl.DataFrame] = []
+
+    for cell, result in zip(cells, results):
+        key, score_col = cell.key, cell.score_col
+        if "error" in result:
+            logger.warning(
+                f"Skipping {score_col} x {cell.grouping} for ruler "
+                f"'{ruler_label}': {result['error']}"
+            )
             continue
 
-        for score_col in score_cols:
-            # One failing (score, grouping) combination must not abort the whole
-            # ruler — otherwise a single degenerate metric (e.g. silver-ruler
-            # HD95) silently loses the entire silver ruler and the cross-ruler
-            # widening. Log and continue, mirroring the OLS guard below.
-            try:
-                key = f"{ruler_label}__{score_col}__{grouping_label}"
-                thr, hib = _beneficial_spec(score_col, thresholds)
-                dir_fn = functools.partial(
-                    disparate_impact_ratio, threshold=thr, higher_is_better=hib
-                )
+        report.save_table(result["summary"], f"summary_{key}")
+        ruler_stats[f"gap_{key}"] = result["gap"]
 
-                summary = group_summary(grouped_df, score_col, group_col)
-                report.save_table(summary, f"summary_{key}")
+        if score_col == "dice_macro":
+            ruler_gaps.append(result["gap"])
+            ruler_gap_labels.append(cell.grouping)
 
-                gap = fairness_gap(
-                    grouped_df, score_col, group_col, threshold=thr, higher_is_better=hib
-                )
-                ruler_stats[f"gap_{key}"] = gap
-
-                if score_col == "dice_macro":
-                    ruler_gaps.append(gap)
-                    ruler_gap_labels.append(grouping_label)
-
-                if score_col in SWEEP_SCORES:
-                    sweep = _sweep_for(score_col, sweep_higher, sweep_hd95)
-                    sw = dir_sensitivity(
-                        grouped_df, score_col, group_col, sweep, higher_is_better=hib
-                    ).with_columns(
-                        pl.lit(grouping_label).alias("grouping"),
-                        pl.lit(score_col).alias("score"),
-                    )
-                    sensitivity_rows.append(sw)
-
-                if ng == 2:
-                    test_result = mann_whitney_test(grouped_df, score_col, group_col)
-                else:
-                    test_result = kruskal_wallis_test(grouped_df, score_col, group_col)
-                ruler_stats[f"test_{key}"] = test_result
-                all_p_values.append(test_result["p"])
-                all_p_labels.append(key)
-
-                ci = bootstrap_ci(grouped_df, score_col, group_col, dir_fn, seed=42)
-                ruler_stats[f"bootstrap_dir_{key}"] = ci
-
-                if score_col == "dice_macro":
-                    ci_results.append(ci)
-                    ci_labels.append(grouping_label)
-
-                perm = permutation_test(grouped_df, score_col, group_col, dir_fn, seed=42)
-                ruler_stats[f"permtest_dir_{key}"] = perm
-
-                violin_by_group(
-                    grouped_df, score_col, group_col, report,
-                    title=f"{ruler_label}: {score_col} by {grouping_label}",
-                    fig_name=f"violin_{key}",
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Skipping {score_col} x {grouping_label} for ruler "
-                    f"'{ruler_label}': {type(e).__name__}: {e}"
-                )
-                continue
+        tags = (pl.lit(cell.grouping).alias("grouping"), pl.lit(score_col).alias("score"))
+        if "sensitivity" in result:
+            sensitivity_rows.append(result["sensitivity"].with_columns(*tags))
+            curve_rows.append(result["curve"].with_columns(*tags))
+
+        ruler_stats[f"test_{key}"] = result["test"]
+        all_p_values.append(result["test"]["p"])
+        all_p_labels.append(key)
+
+        for name, stat_ci in result["cis"].items():
+            ruler_stats[f"bootstrap_{name}_{key}"] = stat_ci
+        if score_col == "dice_macro":
+            ci_results.append(result["cis"]["dir"])
+            ci_labels.append(cell.grouping)
+
+        for name, perm in result["perms"].items():
+            ruler_stats[f"permtest_{name}_{key}"] = perm
+
+        violin_by_group(
+            _cell_frame(cell), score_col, cell.group_col, report,
+            title=f"{ruler_label}: {score_col} by {cell.grouping}",
+            fig_name=f"violin_{key}",
+        )
 
     if sensitivity_rows:
         report.save_table(pl.concat(sensitivity_rows), f"sensitivity_{ruler_label}")
+    if curve_rows:
+        report.save_table(pl.concat(curve_rows), f"curve_{ruler_label}")
 
     if all_p_values:
         corrected = apply_fdr(all_p_values)
@@ -251,14 +599,40 @@ def _analyze_single_ruler(
     try:
         volume_covariates = [Col.SEX, Col.RACE, Col.AGE]
         ols_df = _apply_grouping(df, race[RaceStrategy.WHITE_VS_BLACK], Col.RACE)
-        ols_result = ols_regression(ols_df, "dice_macro", volume_covariates)
-        ruler_stats[f"ols_{ruler_label}"] = ols_result
+        ols_results = _ols_by_score(ols_df, _detect_score_cols(df), volume_covariates, ruler_label)
+        if "dice_macro" in ols_results:
+            ruler_stats[f"ols_{ruler_label}"] = ols_results["dice_macro"]
+        for score_col, ols_result in ols_results.items():
+            ruler_stats[f"ols_{ruler_label}__{score_col}"] = ols_result
     except Exception as e:
         logger.warning(f"OLS regression failed for {ruler_label}: {e}")
 
     return ruler_stats
 
 
+def _ols_by_score(
+    df: pl.DataFrame, score_cols: list[str], covariates: list[str], ruler_label: str
+) -> dict[str, dict]:
+    """OLS of every score column on the covariates, skipping scores that fail.
+
+    Every score column shares one design matrix, so they are fitted in one
+    batch. If the batch raises (e.g. a score with no finite values), each
+    score is refitted alone so only the failing ones are dropped.
+    """
+    try:
+        return ols_regressions(df, score_cols, covariates)
+    except Exception as e:
+        logger.info(f"Batched OLS failed for {ruler_label} ({e}); fitting scores one by one")
+
+    results: dict[str, dict] = {}
+    for score_col in score_cols:
+        try:
+            results[score_col] = ols_regression(df, score_col, covariates)
+        except Exception as e:
+            logger.warning(f"OLS regression failed for {ruler_label} {score_col}: {e}")
+    return results
+
+
 def run(
     evaluation_csvs: list[Path],
     ruler_labels: list[str],
@@ -267,8 +641,29 @@ def run(
     thresholds: dict[str, float] | None = None,
     sweep_higher: list[float] | None = None,
     sweep_hd95: list[float] | None = None,
+    workers: int = 1,
+    cell_cache: bool = False,
+    sequential: bool = False,
+    resample: str = "case",
 ) -> None:
-    """Main orchestrator: load CSVs, join demographics, compute fairness metrics."""
+    """Main orchestrator: load CSVs, join demographics, compute fairness metrics.
+
+    ``workers`` > 1 computes the independent analysis cells in a process pool.
+    Every cell seeds its resampling from its own key, so the output is the
+    same for any worker count. With ``cell_cache=True``, cell results are
+    stored under ``default_cell_cache_dir()`` keyed on a content hash of their
+    inputs (``_cell_digest``); later runs reuse every unchanged cell and only
+    compute new or changed ones.
+
+    ``sequential=True`` lets each bootstrap stop once its CI endpoints are
+    stable and each permutation test once its p-value is clearly on one side
+    of 0.05 (``N_BOOT`` / ``N_PERM`` become upper bounds); every result
+    records the resamples used and the stopping rule.
+
+    ``resample`` is the bootstrap scheme of the CIs: "case" (i.i.d. cases),
+    "stratified" (cases within each group), or "cluster" (patients, with all
+    of their exams).
+    """
     if len(evaluation_csvs) != len(ruler_labels):
         msg = f"Got {len(evaluation_csvs)} CSVs but {len(ruler_labels)} labels"
         raise ValueError(msg)
@@ -284,15 +679,34 @@ def run(
     all_ruler_stats: dict[str, dict] = {}
     all_ruler_gaps: dict[str, list[dict]] = {}
 
+    # Fan the whole (ruler x grouping x score) grid out at once; FDR, plots,
+    # and the cross-ruler comparison run afterwards on the gathered results.
+    ruler_frames: dict[str, pl.DataFrame] = {}
+    ruler_cells: dict[str, list[AnalysisCell]] = {}
+    for csv_path, ruler_label in zip(evaluation_csvs, ruler_labels):
+        eval_df = pl.read_csv(csv_path)
+        eval_df = _add_derived_columns(eval_df)
+        logger.info(f"Loaded {ruler_label}", cases=eval_df.height, columns=eval_df.columns)
+
+        df = eval_df.join(metadata, on=Col.SERIES_SUBMITTER_ID, how="inner")
+        logger.info(f"Ruler '{ruler_label}': joined {df.height} cases")
+        ruler_frames[ruler_label] = df
+        ruler_cells[ruler_label] = _ruler_cells(
+            df, ruler_label, thresholds, sweep_higher, sweep_hd95, sequential, resample
+        )
+
+    cells = [cell for label in ruler_labels for cell in ruler_cells[label]]
+    cache_dir = default_cell_cache_dir() if cell_cache else None
+    results = dict(zip(
+        (cell.key for cell in cells), _run_cells(cells, workers, cache_dir)
+    ))
+
     with EDAReport(report_name, report_type="fairness") as report:
-        for csv_path, ruler_label in zip(evaluation_csvs, ruler_labels):
-            eval_df = pl.read_csv(csv_path)
-            eval_df = _add_derived_columns(eval_df)
-            logger.info(f"Loaded {ruler_label}", cases=eval_df.height, columns=eval_df.columns)
-
-            ruler_stats = _analyze_single_ruler(
-                eval_df, ruler_label, metadata, report,
-                thresholds, sweep_higher, sweep_hd95,
+        for ruler_label in ruler_labels:
+            cells = ruler_cells[ruler_label]
+            ruler_stats = _collect_ruler(
+                ruler_label, ruler_frames[ruler_label], cells,
+                [results[cell.key] for cell in cells], report,
             )
             all_ruler_stats[ruler_label] = ruler_stats
 
@@ -367,6 +781,14 @@ if __name__ == "__main__":
                         help="Sensitivity-sweep thresholds for Dice/nDSC")
     parser.add_argument("--sweep-hd95", type=float, nargs="+", default=DEFAULT_SWEEP_HD95,
                         help="Sensitivity-sweep thresholds (mm) for HD95")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes for the (ruler x grouping x score) cells")
+    parser.add_argument("--cell-cache", action="store_true",
+                        help="Reuse unchanged cell results from processed_dir/fairness_cell_cache")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Stop bootstraps/permutation tests early once settled")
+    parser.add_argument("--resample", choices=RESAMPLING_SCHEMES, default="case",
+                        help="Bootstrap unit: cases, cases within groups, or patients")
     args = parser.parse_args()
 
     run(
@@ -377,4 +799,8 @@ if __name__ == "__main__":
         thresholds={"dice": args.dice_threshold, "ndsc": args.ndsc_threshold, "hd95": args.hd95_threshold},
         sweep_higher=args.sweep_higher,
         sweep_hd95=args.sweep_hd95,
+        workers=args.workers,
+        cell_cache=args.cell_cache,
+        sequential=args.sequential,
+        resample=args.resample,
     )
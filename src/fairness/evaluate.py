@@ -1,32 +1,59 @@
 """Evaluate NIfTI predictions against reference labels.
 
-Computes per-case Dice (and optionally HD95) for each segmentation label,
-emitting a CSV with one row per case. This is the only module in src/fairness
-that touches NIfTI I/O.
+Computes per-case Dice (and optionally nDSC, the boundary metrics HD95,
+HD100, ASSD, NSD, and per-instance Dice / detection F1) for each segmentation
+label, emitting a CSV with one row per case. This is the only module in src/fairness that touches NIfTI I/O.
 
 Usage:
     uv run -m src.fairness.evaluate \
         --predictions <dir> --references <dir> \
         --mapping <case_id_mapping.json> --output <csv> \
-        [--split test] [--metrics dice hd95]
+        [--split test] [--metrics dice hd95 nsd] [--nsd-tolerance 2.0]
+
+    # Every label source against every other, one pass per case (Parquet)
+    uv run -m src.fairness.evaluate \
+        --sources gold=<dir> silver=<dir> ds2=<dir> ... \
+        --mapping <case_id_mapping.json> --output <parquet>
 """
 
 from __future__ import annotations
 
 import json
-from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
 from pathlib import Path
 
-import nibabel as nib
 import numpy as np
 import polars as pl
 
+from src.data.label_volumes import (
+    default_label_cache_dir,
+    label_volume_size,
+    load_label_volume,
+)
+from src.data.mri_volumes import cached_total_voxels
 from src.fairness import LABELS
+from src.fairness.instances import (
+    INSTANCE_COLUMNS,
+    instance_scores,
+    label_instance_match,
+)
+from src.fairness.surface import (
+    BOUNDARY_METRICS,
+    DEFAULT_NSD_TOLERANCE,
+    label_bboxes,
+    label_boundary_metrics,
+)
 from src.utils.logger import get_logger
 
 logger = get_logger("fairness.evaluate")
 
-VALID_METRICS = {"dice", "hd95", "ndsc"}
+VALID_METRICS = {"dice", "ndsc", "instances", *BOUNDARY_METRICS}
+VALID_BACKENDS = ("numpy", "torch")
 
 
 def dice_coefficient(pred: np.ndarray, ref: np.ndarray, label: int) -> float:
@@ -34,70 +61,57 @@ def dice_coefficient(pred: np.ndarray, ref: np.ndarray, label: int) -> float:
 
     Returns NaN if both masks are empty (nnU-Net convention).
     Returns 0.0 if one mask is empty and the other is not.
+    evaluate_case reads every label off one shared ``confusion_matrix``
+    instead of calling this per label.
     """
-    pred_mask = pred == label
-    ref_mask = ref == label
+    return _dice_from_counts(_segmentation_counts(confusion_matrix(pred, ref), label))
 
-    pred_sum = pred_mask.sum()
-    ref_sum = ref_mask.sum()
 
-    if pred_sum == 0 and ref_sum == 0:
-        return float("nan")
-    if pred_sum == 0 or ref_sum == 0:
-        return 0.0
-
-    intersection = (pred_mask & ref_mask).sum()
-    return float(2.0 * intersection / (pred_sum + ref_sum))
+def confusion_matrix(
+    pred: np.ndarray, ref: np.ndarray, n_labels: int | None = None
+) -> np.ndarray:
+    """Voxel confusion table for all labels in a single pass.
 
-
-def hausdorff_95(
-    pred: np.ndarray,
-    ref: np.ndarray,
-    label: int,
-    spacing: tuple[float, ...],
-) -> float:
-    """95th-percentile Hausdorff distance in mm for a single label.
-
-    Returns NaN if both masks are empty.
-    Returns inf if exactly one mask is empty.
+    Entry ``[r, p]`` counts voxels with reference label ``r`` and predicted
+    label ``p``. Every overlap metric (Dice, nDSC counts) is derived from this
+    table, so the volume is traversed once regardless of how many labels or
+    metrics are requested.
     """
-    from surface_distance import (
-        compute_robust_hausdorff,
-        compute_surface_distances,
-    )
+    if n_labels is None:
+        n_labels = int(max(pred.max(), ref.max(), max(LABELS))) + 1
+    flat = ref.astype(np.intp) * n_labels + pred
+    counts = np.bincount(flat.ravel(order="K"), minlength=n_labels * n_labels)
+    return counts.reshape(n_labels, n_labels)
 
-    pred_mask = pred == label
-    ref_mask = ref == label
 
-    pred_any = pred_mask.any()
-    ref_any = ref_mask.any()
-
-    if not pred_any and not ref_any:
-        return float("nan")
-    if not pred_any or not ref_any:
-        return float("inf")
+def _segmentation_counts(confusion: np.ndarray, label: int) -> dict[str, int]:
+    """TP, FP, FN counts and reference volume for a single label."""
+    tp = int(confusion[label, label])
+    ref_vol = int(confusion[label, :].sum())
+    pred_vol = int(confusion[:, label].sum())
+    return {"tp": tp, "fp": pred_vol - tp, "fn": ref_vol - tp, "ref_vol": ref_vol}
 
-    distances = compute_surface_distances(ref_mask, pred_mask, spacing_mm=spacing)
-    return float(compute_robust_hausdorff(distances, 95.0))
 
+def _dice_from_counts(counts: dict[str, int]) -> float:
+    """Dice from TP/FP/FN counts, with the same empty-mask rules as dice_coefficient."""
+    pred_sum = counts["tp"] + counts["fp"]
+    ref_sum = counts["ref_vol"]
 
-def _segmentation_counts(
-    pred: np.ndarray, ref: np.ndarray, label: int
-) -> dict[str, int]:
-    """TP, FP, FN counts for a single label (used by nDSC)."""
-    pred_mask = pred == label
-    ref_mask = ref == label
-    tp = int((pred_mask & ref_mask).sum())
-    fp = int((pred_mask & ~ref_mask).sum())
-    fn = int((~pred_mask & ref_mask).sum())
-    return {"tp": tp, "fp": fp, "fn": fn, "ref_vol": int(ref_mask.sum())}
+    if pred_sum == 0 and ref_sum == 0:
+        return float("nan")
+    if pred_sum == 0 or ref_sum == 0:
+        return 0.0
+    return float(2.0 * counts["tp"] / (pred_sum + ref_sum))
 
 
-def _compute_ndsc(df: pl.DataFrame) -> pl.DataFrame:
+def _compute_ndsc(df: pl.DataFrame, by: list[str] | None = None) -> pl.DataFrame:
     """Compute nDSC from intermediate counts (Raina et al. 2023).
 
     Two-pass: first derives effective_load per label from the dataset,
-    then computes nDSC per case. Drops intermediate columns.
+    then computes nDSC per case. With ``by`` (e.g. ``["model"]``) the
+    effective load is derived separately within each group, so a long table
+    of several models gives the same nDSC as evaluating each model alone.
+    Drops intermediate columns.
     """
     for label_name in LABELS.values():
         tp = f"_tp_{label_name}"
@@ -106,13 +120,27 @@ def _compute_ndsc(df: pl.DataFrame) -> pl.DataFrame:
         rv = f"_ref_vol_{label_name}"
         tv = "_total_voxels"
 
-        effective_load = float(
-            df.select((pl.col(rv).cast(pl.Float64) / pl.col(tv)).mean()).item()
-        )
-        logger.info("nDSC effective_load", label=label_name, r=f"{effective_load:.6f}")
+        load_expr = (pl.col(rv).cast(pl.Float64) / pl.col(tv)).mean()
+        if by:
+            load_expr = load_expr.over(by)
+        df = df.with_columns(load_expr.alias("_effective_load"))
+
+        if by:
+            for row in df.group_by(by, maintain_order=True).agg(
+                pl.col("_effective_load").first()
+            ).iter_rows(named=True):
+                groups = {k: row[k] for k in by}
+                logger.info(
+                    "nDSC effective_load", label=label_name,
+                    r=f"{row['_effective_load']:.6f}", **groups,
+                )
+        else:
+            effective_load = float(df["_effective_load"][0])
+            logger.info("nDSC effective_load", label=label_name, r=f"{effective_load:.6f}")
 
+        r = pl.col("_effective_load")
         non_ref = pl.col(tv).cast(pl.Float64) - pl.col(rv)
-        kappa = (1.0 - effective_load) * pl.col(rv) / (effective_load * non_ref)
+        kappa = (1.0 - r) * pl.col(rv) / (r * non_ref)
 
         ndsc_expr = (
             2.0 * pl.col(tp)
@@ -133,81 +161,360 @@ def _compute_ndsc(df: pl.DataFrame) -> pl.DataFrame:
     return df
 
 
+def _check_shapes(case_id: str, pred: np.ndarray, ref: np.ndarray) -> None:
+    if ref.shape != pred.shape:
+        msg = (
+            f"Shape mismatch for {case_id}: "
+            f"pred {pred.shape} vs ref {ref.shape}"
+        )
+        raise ValueError(msg)
+
+
+def _label_columns(
+    label_name: str,
+    metrics: set[str],
+    counts: dict[str, int] | None,
+    surface: dict[str, float] | None,
+    instances: dict[str, float] | None = None,
+) -> dict:
+    """Metric columns for one label from its overlap counts, boundary metrics,
+    and instance scores."""
+    columns: dict = {}
+    if "dice" in metrics:
+        columns[f"dice_{label_name}"] = _dice_from_counts(counts)
+    if surface is not None:
+        for metric in BOUNDARY_METRICS:
+            if metric in metrics:
+                columns[f"{metric}_{label_name}"] = surface[metric]
+    if instances is not None:
+        for column in INSTANCE_COLUMNS:
+            columns[f"{column}_{label_name}"] = instances[column]
+    if "ndsc" in metrics:
+        columns[f"_tp_{label_name}"] = counts["tp"]
+        columns[f"_fp_{label_name}"] = counts["fp"]
+        columns[f"_fn_{label_name}"] = counts["fn"]
+        columns[f"_ref_vol_{label_name}"] = counts["ref_vol"]
+    return columns
+
+
+def _empty_results(metrics: set[str]) -> pl.DataFrame:
+    """Zero-row per-case table with the columns evaluate_folder would return."""
+    schema: dict[str, pl.DataType] = {
+        "model": pl.String,
+        "case_id": pl.String,
+        "series_submitter_id": pl.String,
+    }
+    for label_name in LABELS.values():
+        if "dice" in metrics:
+            schema[f"dice_{label_name}"] = pl.Float64
+        for metric in BOUNDARY_METRICS:
+            if metric in metrics:
+                schema[f"{metric}_{label_name}"] = pl.Float64
+        if "instances" in metrics:
+            for column in INSTANCE_COLUMNS:
+                schema[f"{column}_{label_name}"] = (
+                    pl.Float64 if column in ("inst_dice", "inst_f1") else pl.Int64
+                )
+    if "ndsc" in metrics:
+        for label_name in LABELS.values():
+            schema[f"ndsc_{label_name}"] = pl.Float64
+    return pl.DataFrame(schema=schema)
+
+
+def _needs_bboxes(metrics: set[str]) -> bool:
+    """Whether any requested metric works on per-label bounding boxes."""
+    return "instances" in metrics or any(m in metrics for m in BOUNDARY_METRICS)
+
+
+def _score_volumes(
+    pred_data: np.ndarray,
+    ref_data: np.ndarray,
+    spacing: tuple[float, ...],
+    metrics: set[str],
+    nsd_tolerance: float,
+    ref_bboxes: list[tuple[slice, ...] | None] | None = None,
+    confusion: np.ndarray | None = None,
+) -> dict:
+    """All requested per-label metric columns for one pred/ref volume pair.
+
+    Boundary metrics (HD95, HD100, ASSD, NSD) share one pair of distance
+    transforms per label, so requesting several costs about as much as one.
+    ``ref_bboxes`` lets callers scoring several predictions against the same
+    reference find its label boxes once; ``confusion`` passes in a confusion
+    table computed elsewhere (e.g. by the torch backend).
+    """
+    result: dict = {}
+
+    if "ndsc" in metrics:
+        result["_total_voxels"] = int(ref_data.size)
+
+    overlap = bool(metrics & {"dice", "ndsc"})
+    if overlap and confusion is None:
+        confusion = confusion_matrix(pred_data, ref_data)
+
+    boundary = any(m in metrics for m in BOUNDARY_METRICS)
+    instances = "instances" in metrics
+    if _needs_bboxes(metrics):
+        max_label = max(LABELS)
+        pred_bboxes = label_bboxes(pred_data, max_label)
+        if ref_bboxes is None:
+            ref_bboxes = label_bboxes(ref_data, max_label)
+
+    for label_int, label_name in LABELS.items():
+        counts = _segmentation_counts(confusion, label_int) if overlap else None
+        surface = (
+            label_boundary_metrics(
+                pred_data, ref_data, label_int, spacing,
+                tolerance=nsd_tolerance,
+                pred_bbox=pred_bboxes[label_int - 1],
+                ref_bbox=ref_bboxes[label_int - 1],
+            )
+            if boundary
+            else None
+        )
+        match = (
+            label_instance_match(
+                pred_data, ref_data, label_int,
+                pred_bbox=pred_bboxes[label_int - 1],
+                ref_bbox=ref_bboxes[label_int - 1],
+            )
+            if instances
+            else None
+        )
+        result.update(_label_columns(
+            label_name, metrics, counts, surface,
+            instance_scores(match) if instances else None,
+        ))
+
+    return result
+
+
+def _score_volume_pair(
+    data_a: np.ndarray,
+    data_b: np.ndarray,
+    spacing: tuple[float, ...],
+    metrics: set[str],
+    nsd_tolerance: float,
+    bboxes_a: list[tuple[slice, ...] | None] | None = None,
+    bboxes_b: list[tuple[slice, ...] | None] | None = None,
+) -> tuple[dict, dict]:
+    """Metric columns for a scored against b, and for b scored against a.
+
+    One confusion table serves both directions (the reverse is its
+    transpose), and the boundary metrics and instance matching are symmetric,
+    so each unordered pair of label sources is traversed once. Each returned dict equals
+    ``_score_volumes`` for that direction.
+    """
+    a_vs_b: dict = {}
+    b_vs_a: dict = {}
+
+    if "ndsc" in metrics:
+        a_vs_b["_total_voxels"] = b_vs_a["_total_voxels"] = int(data_b.size)
+
+    overlap = bool(metrics & {"dice", "ndsc"})
+    if overlap:
+        confusion = confusion_matrix(data_a, data_b)
+
+    boundary = any(m in metrics for m in BOUNDARY_METRICS)
+    instances = "instances" in metrics
+    if _needs_bboxes(metrics):
+        max_label = max(LABELS)
+        if bboxes_a is None:
+            bboxes_a = label_bboxes(data_a, max_label)
+        if bboxes_b is None:
+            bboxes_b = label_bboxes(data_b, max_label)
+
+    for label_int, label_name in LABELS.items():
+        surface = (
+            label_boundary_metrics(
+                data_a, data_b, label_int, spacing,
+                tolerance=nsd_tolerance,
+                pred_bbox=bboxes_a[label_int - 1],
+                ref_bbox=bboxes_b[label_int - 1],
+            )
+            if boundary
+            else None
+        )
+        match = (
+            label_instance_match(
+                data_a, data_b, label_int,
+                pred_bbox=bboxes_a[label_int - 1],
+                ref_bbox=bboxes_b[label_int - 1],
+            )
+            if instances
+            else None
+        )
+        a_vs_b.update(_label_columns(
+            label_name, metrics,
+            _segmentation_counts(confusion, label_int) if overlap else None,
+            surface,
+            instance_scores(match) if instances else None,
+        ))
+        b_vs_a.update(_label_columns(
+            label_name, metrics,
+            _segmentation_counts(confusion.T, label_int) if overlap else None,
+            surface,
+            instance_scores(match, reverse=True) if instances else None,
+        ))
+
+    return a_vs_b, b_vs_a
+
+
 def evaluate_case(
     pred_path: Path,
     ref_path: Path,
     case_id: str,
     series_submitter_id: str,
     metrics: set[str] | None = None,
+    nsd_tolerance: float = DEFAULT_NSD_TOLERANCE,
+    cache_dir: Path | None = None,
 ) -> dict:
-    """Load one prediction/reference NIfTI pair and compute all requested metrics."""
+    """Load one prediction/reference NIfTI pair and compute all requested metrics.
+
+    With ``cache_dir`` set, volumes go through the decoded label-volume cache.
+    """
     if metrics is None:
         metrics = {"dice"}
 
-    ref_img = nib.load(ref_path)
-    ref_data = ref_img.get_fdata().astype(np.uint8)
-    pred_data = nib.load(pred_path).get_fdata().astype(np.uint8)
-
-    if ref_data.shape != pred_data.shape:
-        msg = (
-            f"Shape mismatch for {case_id}: "
-            f"pred {pred_data.shape} vs ref {ref_data.shape}"
-        )
-        raise ValueError(msg)
+    ref_data, ref_zooms = load_label_volume(ref_path, cache_dir=cache_dir)
+    pred_data, _ = load_label_volume(pred_path, cache_dir=cache_dir)
+    _check_shapes(case_id, pred_data, ref_data)
 
     result: dict = {
         "case_id": case_id,
         "series_submitter_id": series_submitter_id,
     }
+    result.update(
+        _score_volumes(pred_data, ref_data, ref_zooms[:3], metrics, nsd_tolerance)
+    )
+    return result
 
-    if "ndsc" in metrics:
-        result["_total_voxels"] = int(ref_data.size)
 
-    for label_int, label_name in LABELS.items():
-        if "dice" in metrics:
-            result[f"dice_{label_name}"] = dice_coefficient(pred_data, ref_data, label_int)
+def evaluate_case_models(
+    pred_paths: dict[str, Path],
+    ref_path: Path,
+    case_id: str,
+    series_submitter_id: str,
+    metrics: set[str] | None = None,
+    nsd_tolerance: float = DEFAULT_NSD_TOLERANCE,
+    cache_dir: Path | None = None,
+    backend: str = "numpy",
+    threads: int | None = None,
+) -> list[dict]:
+    """Score several models' predictions for one case against one reference.
 
-        if "hd95" in metrics:
-            spacing = ref_img.header.get_zooms()[:3]
-            result[f"hd95_{label_name}"] = hausdorff_95(
-                pred_data, ref_data, label_int, tuple(float(s) for s in spacing)
-            )
+    The reference is decoded (and its label boxes found) once, then every
+    prediction in ``pred_paths`` (model label -> NIfTI path) is scored against
+    it. Returns one row per model with a leading ``model`` column.
 
-        if "ndsc" in metrics:
-            counts = _segmentation_counts(pred_data, ref_data, label_int)
-            result[f"_tp_{label_name}"] = counts["tp"]
-            result[f"_fp_{label_name}"] = counts["fp"]
-            result[f"_fn_{label_name}"] = counts["fn"]
-            result[f"_ref_vol_{label_name}"] = counts["ref_vol"]
+    With ``backend="torch"``, the confusion tables of all models are computed
+    as one batch by ``torch_overlap.confusion_matrices`` using ``threads``
+    intra-op threads; results are identical to the NumPy backend.
+    """
+    if metrics is None:
+        metrics = {"dice"}
 
-    return result
+    ref_data, ref_zooms = load_label_volume(ref_path, cache_dir=cache_dir)
+    spacing = ref_zooms[:3]
+    ref_bboxes = (
+        label_bboxes(ref_data, max(LABELS))
+        if _needs_bboxes(metrics)
+        else None
+    )
+
+    preds: dict[str, np.ndarray] = {}
+    for model, pred_path in pred_paths.items():
+        preds[model], _ = load_label_volume(pred_path, cache_dir=cache_dir)
+        _check_shapes(case_id, preds[model], ref_data)
+
+    confusions: dict[str, np.ndarray] = {}
+    if backend == "torch" and metrics & {"dice", "ndsc"}:
+        from src.fairness.torch_overlap import confusion_matrices
+
+        n_labels = 1 + int(
+            max(ref_data.max(), *(pred.max() for pred in preds.values()), max(LABELS))
+        )
+        batch = confusion_matrices(
+            [(pred, ref_data) for pred in preds.values()], n_labels, threads=threads
+        )
+        confusions = dict(zip(preds, batch))
+
+    rows: list[dict] = []
+    for model, pred_data in preds.items():
+        row: dict = {
+            "model": model,
+            "case_id": case_id,
+            "series_submitter_id": series_submitter_id,
+        }
+        row.update(
+            _score_volumes(
+                pred_data, ref_data, spacing, metrics, nsd_tolerance,
+                ref_bboxes=ref_bboxes, confusion=confusions.get(model),
+            )
+        )
+        rows.append(row)
+    return rows
 
 
-def _evaluate_case_args(args: tuple) -> dict | None:
+def _evaluate_case_args(args: tuple) -> list[dict]:
     """Wrapper for ProcessPoolExecutor (top-level function for pickling)."""
-    pred_path, ref_path, case_id, series_submitter_id, metrics = args
-    return evaluate_case(
-        Path(pred_path),
+    (
+        pred_paths, ref_path, case_id, series_submitter_id,
+        metrics, nsd_tolerance, cache_dir, backend, threads,
+    ) = args
+    return evaluate_case_models(
+        {model: Path(p) for model, p in pred_paths.items()},
         Path(ref_path),
         case_id,
         series_submitter_id,
         metrics=metrics,
+        nsd_tolerance=nsd_tolerance,
+        cache_dir=cache_dir,
+        backend=backend,
+        threads=threads,
     )
 
 
 def evaluate_folder(
-    pred_dir: Path,
+    pred_dir: Path | dict[str, Path],
     ref_dir: Path,
     mapping: list[dict],
     output_path: Path | None = None,
     metrics: set[str] | None = None,
     split: str = "test",
     workers: int = 1,
+    nsd_tolerance: float = DEFAULT_NSD_TOLERANCE,
+    volume_cache: bool = False,
+    resume: bool = False,
+    backend: str = "numpy",
+    threads: int | None = None,
 ) -> pl.DataFrame:
     """Evaluate all matching prediction/reference pairs in the directories.
 
     Only evaluates cases where both prediction and reference files exist
-    and the mapping entry matches the requested split.
+    and the mapping entry matches the requested split. With volume_cache=True,
+    decoded volumes are shared across runs through the label-volume cache, so
+    re-evaluating the same references (gold/silver rulers, ds1-3 on gold) skips
+    the gzip decode.
+
+    ``pred_dir`` may be a dict of model label -> prediction directory. Each
+    reference is then loaded once per case and scored against every model,
+    and the result is a long table with a leading ``model`` column (nDSC's
+    effective load is computed per model). If ``output_path`` contains
+    ``{model}``, one CSV per model is written instead, each identical to a
+    single-model run.
+
+    With ``output_path`` set, each case's raw rows (including the nDSC
+    counts) are written to a Parquet part in the ``<output>.parts/`` sidecar
+    as soon as the case finishes, so a crash or wall-clock kill loses at most
+    the cases in flight. ``resume=True`` keeps the parts of an earlier run
+    with the same settings and only evaluates the missing case_ids; otherwise
+    a stale sidecar is cleared. nDSC is computed from the persisted counts,
+    and the sidecar is removed once the outputs are written.
+
+    ``backend="torch"`` computes the overlap counts with torch's multithreaded
+    CPU ops (``threads`` per worker process) instead of NumPy, so a node can
+    run a few many-threaded workers instead of many single-threaded ones.
     """
     if metrics is None:
         metrics = {"dice"}
@@ -216,59 +523,459 @@ def evaluate_folder(
     if invalid:
         msg = f"Unknown metrics: {invalid}. Valid: {VALID_METRICS}"
         raise ValueError(msg)
+    if backend not in VALID_BACKENDS:
+        msg = f"Unknown backend: {backend!r}. Valid: {VALID_BACKENDS}"
+        raise ValueError(msg)
+
+    multi_model = isinstance(pred_dir, dict)
+    pred_dirs = pred_dir if multi_model else {"": pred_dir}
+    cache_dir = default_label_cache_dir() if volume_cache else None
 
     filtered = [e for e in mapping if e["split"] == split]
-    logger.info("Evaluating", split=split, cases=len(filtered), metrics=sorted(metrics), workers=workers)
+    logger.info(
+        "Evaluating", split=split, cases=len(filtered), models=len(pred_dirs),
+        metrics=sorted(metrics), workers=workers, backend=backend,
+    )
 
     work_items: list[tuple] = []
     for entry in filtered:
         case_id = entry["case_id"]
-        pred_path = pred_dir / f"{case_id}.nii.gz"
         ref_path = ref_dir / f"{case_id}.nii.gz"
 
-        if not pred_path.exists():
-            logger.warning("Missing prediction", case_id=case_id)
-            continue
         if not ref_path.exists():
             logger.warning("Missing reference", case_id=case_id)
             continue
 
+        pred_paths: dict[str, str] = {}
+        for model, model_dir in pred_dirs.items():
+            pred_path = model_dir / f"{case_id}.nii.gz"
+            if pred_path.exists():
+                pred_paths[model] = str(pred_path)
+            elif multi_model:
+                logger.warning("Missing prediction", case_id=case_id, model=model)
+            else:
+                logger.warning("Missing prediction", case_id=case_id)
+        if not pred_paths:
+            continue
+
         work_items.append((
-            str(pred_path), str(ref_path), case_id,
-            entry["series_submitter_id"], metrics,
+            pred_paths, str(ref_path), case_id,
+            entry["series_submitter_id"], metrics, nsd_tolerance, cache_dir,
+            backend, threads,
         ))
 
+    parts_dir = None
+    if output_path is not None:
+        parts_dir = _checkpoint_dir(output_path)
+        manifest = {
+            "split": split,
+            "metrics": sorted(metrics),
+            "nsd_tolerance": nsd_tolerance,
+            "models": {m: str(d) for m, d in pred_dirs.items()},
+            "references": str(ref_dir),
+        }
+        _open_checkpoint(parts_dir, manifest, resume)
+
+    done: dict[str, pl.DataFrame] = {}
+    pending = work_items
+    if resume and parts_dir is not None:
+        for item in work_items:
+            part = _part_path(parts_dir, item[2])
+            if part.exists():
+                done[item[2]] = pl.read_parquet(part)
+        pending = [item for item in work_items if item[2] not in done]
+        logger.info("Resuming", done=len(done), remaining=len(pending))
+
+    def _finish(case_id: str, rows: list[dict]) -> None:
+        frame = pl.DataFrame(rows)
+        if parts_dir is not None:
+            _write_part(parts_dir, case_id, frame)
+        done[case_id] = frame
+
+    costs = _case_costs(
+        [(item[1], item[3], len(item[0])) for item in pending], workers
+    )
+    for case_id, rows in _run_cases(
+        _evaluate_case_args, [(item[2], item) for item in pending], costs, workers
+    ):
+        _finish(case_id, rows)
+
+    # Reassemble in mapping order so the CSV does not depend on completion order
+    frames = [done[item[2]] for item in work_items if item[2] in done]
+    if frames:
+        df = pl.concat(frames, how="diagonal_relaxed")
+        if "ndsc" in metrics:
+            df = _compute_ndsc(df, by=["model"] if multi_model else None)
+    else:
+        logger.warning("No cases to evaluate", split=split)
+        df = _empty_results(metrics)
+
+    if not multi_model:
+        df = df.drop("model")
+
+    logger.success("Evaluation complete", cases=df.height, models=len(pred_dirs))
+
+    if output_path is not None:
+        _write_outputs(df, output_path, list(pred_dirs) if multi_model else None)
+        shutil.rmtree(parts_dir)
+
+    return df
+
+
+def _case_costs(cases: list[tuple[str, str, int]], workers: int) -> list[int]:
+    """Relative cost estimate per case: voxel count times units of work.
+
+    ``cases`` holds (reference path, series_submitter_id, units) per case, where
+    units is the number of volume pairs scored. Voxel counts come from the
+    header-derived ``volume_properties.parquet`` cache, falling back to the
+    reference NIfTI header. Only used for ordering, so sequential runs skip it.
+    """
+    if workers <= 1:
+        return [0] * len(cases)
+
+    voxels = cached_total_voxels()
+    return [
+        (voxels.get(sid) or label_volume_size(Path(ref_path))) * units
+        for ref_path, sid, units in cases
+    ]
+
+
+def _timed_call(
+    fn: Callable[[tuple], list[dict]], args: tuple
+) -> tuple[list[dict], float]:
+    """Run one case and measure its wall time in the worker (excludes queueing)."""
+    start = time.perf_counter()
+    rows = fn(args)
+    return rows, time.perf_counter() - start
+
+
+def _run_cases(
+    fn: Callable[[tuple], list[dict]],
+    cases: list[tuple[str, tuple]],
+    costs: list[int],
+    workers: int,
+) -> Iterator[tuple[str, list[dict]]]:
+    """Evaluate (case_id, args) items largest-cost first, yielding as each finishes.
+
+    With several workers every case is its own task (chunksize 1) and results
+    are consumed with as_completed, so the biggest volumes start first instead
+    of landing on one worker at the end of the run. Logs each case's wall time
+    and the slowest cases at the end.
+    """
+    order = sorted(range(len(cases)), key=lambda i: -costs[i])
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+
+    def _record(case_id: str, seconds: float) -> None:
+        timings[case_id] = seconds
+        logger.info(
+            "Case done", case_id=case_id, seconds=f"{seconds:.2f}",
+            progress=f"{len(timings)}/{len(cases)}",
+        )
+
     if workers > 1:
         with ProcessPoolExecutor(max_workers=workers) as pool:
-            results = list(pool.map(_evaluate_case_args, work_items))
+            futures = {
+                pool.submit(_timed_call, fn, cases[i][1]): cases[i][0] for i in order
+            }
+            for future in as_completed(futures):
+                rows, seconds = future.result()
+                _record(futures[future], seconds)
+                yield futures[future], rows
     else:
-        results = [_evaluate_case_args(item) for item in work_items]
+        for i in order:
+            rows, seconds = _timed_call(fn, cases[i][1])
+            _record(cases[i][0], seconds)
+            yield cases[i][0], rows
+
+    if timings:
+        slowest = sorted(timings.items(), key=lambda kv: -kv[1])[:5]
+        logger.info(
+            "Case timings",
+            wall=f"{time.perf_counter() - start:.1f}s",
+            total=f"{sum(timings.values()):.1f}s",
+            mean=f"{sum(timings.values()) / len(timings):.2f}s",
+            slowest=", ".join(f"{c}={t:.1f}s" for c, t in slowest),
+        )
 
-    df = pl.DataFrame(results)
 
-    if "ndsc" in metrics:
-        df = _compute_ndsc(df)
+def _checkpoint_dir(output_path: Path) -> Path:
+    """Sidecar directory holding per-case Parquet parts for ``output_path``."""
+    return output_path.with_name(f"{output_path.name}.parts")
 
-    logger.success("Evaluation complete", cases=df.height)
 
-    if output_path is not None:
+def _part_path(parts_dir: Path, case_id: str) -> Path:
+    return parts_dir / f"{case_id}.parquet"
+
+
+def _open_checkpoint(parts_dir: Path, manifest: dict, resume: bool) -> None:
+    """Prepare the sidecar: keep it for a matching resume, else start empty.
+
+    Raises ValueError when resuming from parts written with different
+    settings (metrics, tolerance, split, or input directories), since mixing
+    them would silently corrupt the output.
+    """
+    manifest_path = parts_dir / "manifest.json"
+    if resume and manifest_path.exists():
+        previous = json.loads(manifest_path.read_text())
+        if previous != manifest:
+            msg = (
+                f"Cannot resume from {parts_dir}: it was written with "
+                f"different settings ({previous}). Delete it or drop --resume."
+            )
+            raise ValueError(msg)
+        return
+
+    if parts_dir.exists():
+        shutil.rmtree(parts_dir)
+    parts_dir.mkdir(parents=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+
+
+def _write_part(parts_dir: Path, case_id: str, frame: pl.DataFrame) -> None:
+    """Write one case's rows atomically (a killed run never leaves a partial part)."""
+    part = _part_path(parts_dir, case_id)
+    tmp = part.with_suffix(".tmp")
+    frame.write_parquet(tmp)
+    os.replace(tmp, part)
+
+
+def _write_outputs(
+    df: pl.DataFrame, output_path: Path, models: list[str] | None
+) -> None:
+    """Write one CSV, or one per model when output_path contains ``{model}``."""
+    if models is None or "{model}" not in str(output_path):
         output_path.parent.mkdir(parents=True, exist_ok=True)
         df.write_csv(output_path)
         logger.info("Saved CSV", path=str(output_path))
+        return
+
+    for model in models:
+        path = Path(str(output_path).format(model=model))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.filter(pl.col("model") == model).drop("model").write_csv(path)
+        logger.info("Saved CSV", model=model, path=str(path))
+
+
+MATRIX_INDEX = ["case_id", "series_submitter_id", "source_a", "source_b"]
+
+
+def evaluate_case_matrix(
+    source_paths: dict[str, Path],
+    case_id: str,
+    series_submitter_id: str,
+    metrics: set[str] | None = None,
+    nsd_tolerance: float = DEFAULT_NSD_TOLERANCE,
+    cache_dir: Path | None = None,
+) -> list[dict]:
+    """Score every ordered pair of label sources for one case.
+
+    Each volume in ``source_paths`` (source label -> NIfTI path) is decoded
+    once. Every unordered pair is then scored in one pass (see
+    ``_score_volume_pair``), giving two rows: ``source_a`` scored as the
+    prediction against ``source_b`` as the reference, and the reverse.
+    Spacing is taken from the first source.
+    """
+    if metrics is None:
+        metrics = {"dice"}
+
+    volumes: dict[str, np.ndarray] = {}
+    spacing: tuple[float, ...] = ()
+    for name, path in source_paths.items():
+        data, zooms = load_label_volume(path, cache_dir=cache_dir)
+        if volumes:
+            _check_shapes(case_id, data, next(iter(volumes.values())))
+        else:
+            spacing = zooms[:3]
+        volumes[name] = data
+
+    bboxes = (
+        {name: label_bboxes(data, max(LABELS)) for name, data in volumes.items()}
+        if _needs_bboxes(metrics)
+        else {}
+    )
+
+    rows: list[dict] = []
+    for a, b in combinations(volumes, 2):
+        a_vs_b, b_vs_a = _score_volume_pair(
+            volumes[a], volumes[b], spacing, metrics, nsd_tolerance,
+            bboxes_a=bboxes.get(a), bboxes_b=bboxes.get(b),
+        )
+        for source_a, source_b, columns in ((a, b, a_vs_b), (b, a, b_vs_a)):
+            rows.append({
+                "case_id": case_id,
+                "series_submitter_id": series_submitter_id,
+                "source_a": source_a,
+                "source_b": source_b,
+                **columns,
+            })
+    return rows
+
+
+def _evaluate_case_matrix_args(args: tuple) -> list[dict]:
+    """Wrapper for ProcessPoolExecutor (top-level function for pickling)."""
+    source_paths, case_id, series_submitter_id, metrics, nsd_tolerance, cache_dir = args
+    return evaluate_case_matrix(
+        {name: Path(p) for name, p in source_paths.items()},
+        case_id,
+        series_submitter_id,
+        metrics=metrics,
+        nsd_tolerance=nsd_tolerance,
+        cache_dir=cache_dir,
+    )
+
+
+def evaluate_matrix(
+    sources: dict[str, Path],
+    mapping: list[dict],
+    output_path: Path | None = None,
+    metrics: set[str] | None = None,
+    split: str = "test",
+    workers: int = 1,
+    nsd_tolerance: float = DEFAULT_NSD_TOLERANCE,
+    volume_cache: bool = False,
+) -> pl.DataFrame:
+    """Evaluate every label source against every other in a single pass.
+
+    ``sources`` maps a source label (model predictions, gold or silver
+    rulers) to a directory of ``{case_id}.nii.gz`` files. Each case's volumes
+    are decoded once and all ordered pairs are scored, replacing one
+    evaluate_folder run per pair. Cases present in fewer than two sources are
+    skipped.
+
+    Returns a tidy table with columns case_id, series_submitter_id,
+    source_a, source_b, metric, value, where ``source_a`` plays the
+    prediction and ``source_b`` the reference, and ``metric`` uses the
+    evaluate_folder column names (``dice_SC``, ``hd95_CSF``, ...). nDSC's
+    effective load is computed per (source_a, source_b) pair. Use
+    ``matrix_pair`` to get one pair back in the per-case CSV layout.
+    """
+    if metrics is None:
+        metrics = {"dice"}
+
+    invalid = metrics - VALID_METRICS
+    if invalid:
+        msg = f"Unknown metrics: {invalid}. Valid: {VALID_METRICS}"
+        raise ValueError(msg)
+    if len(sources) < 2:
+        msg = f"Matrix evaluation needs at least two sources, got {list(sources)}"
+        raise ValueError(msg)
+
+    cache_dir = default_label_cache_dir() if volume_cache else None
+
+    filtered = [e for e in mapping if e["split"] == split]
+    logger.info(
+        "Evaluating matrix", split=split, cases=len(filtered),
+        sources=list(sources), metrics=sorted(metrics), workers=workers,
+    )
+
+    work_items: list[tuple] = []
+    for entry in filtered:
+        case_id = entry["case_id"]
+        source_paths: dict[str, str] = {}
+        for name, source_dir in sources.items():
+            path = source_dir / f"{case_id}.nii.gz"
+            if path.exists():
+                source_paths[name] = str(path)
+            else:
+                logger.warning("Missing volume", case_id=case_id, source=name)
+        if len(source_paths) < 2:
+            continue
+
+        work_items.append((
+            source_paths, case_id, entry["series_submitter_id"],
+            metrics, nsd_tolerance, cache_dir,
+        ))
+
+    # Cost unit: one unordered pair of sources per case
+    costs = _case_costs(
+        [
+            (next(iter(paths.values())), sid, len(paths) * (len(paths) - 1) // 2)
+            for paths, _, sid, *_ in work_items
+        ],
+        workers,
+    )
+    results = dict(_run_cases(
+        _evaluate_case_matrix_args,
+        [(item[1], item) for item in work_items],
+        costs,
+        workers,
+    ))
+
+    # Reassemble in mapping order so the table does not depend on completion order
+    rows = [row for item in work_items for row in results[item[1]]]
+    if rows:
+        df = pl.DataFrame(rows)
+        if "ndsc" in metrics:
+            df = _compute_ndsc(df, by=["source_a", "source_b"])
+        df = df.unpivot(
+            index=MATRIX_INDEX, variable_name="metric", value_name="value"
+        ).with_columns(pl.col("value").cast(pl.Float64))
+    else:
+        logger.warning("No cases to evaluate", split=split)
+        df = pl.DataFrame(schema={
+            **dict.fromkeys(MATRIX_INDEX, pl.String),
+            "metric": pl.String,
+            "value": pl.Float64,
+        })
+
+    logger.success(
+        "Matrix evaluation complete", cases=len(work_items),
+        pairs=df.select("source_a", "source_b").unique().height, rows=df.height,
+    )
+
+    if output_path is not None:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        df.write_parquet(output_path)
+        logger.info("Saved Parquet", path=str(output_path))
 
     return df
 
 
+def matrix_pair(matrix: pl.DataFrame, source_a: str, source_b: str) -> pl.DataFrame:
+    """One (source_a vs source_b) slice of a matrix as an evaluate_folder table.
+
+    The result has one row per case and the same columns as the per-pair CSV
+    (``source_a`` as predictions, ``source_b`` as references), so it can be
+    fed to the analysis like an ``eval_*.csv``.
+    """
+    pair = matrix.filter(
+        (pl.col("source_a") == source_a) & (pl.col("source_b") == source_b)
+    )
+    if pair.is_empty():
+        msg = f"No rows for source_a={source_a!r}, source_b={source_b!r}"
+        raise ValueError(msg)
+    return pair.pivot(
+        on="metric", index=["case_id", "series_submitter_id"], values="value"
+    )
+
+
 if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(
         description="Evaluate NIfTI predictions against reference labels"
     )
-    parser.add_argument("--predictions", type=Path, required=True)
-    parser.add_argument("--references", type=Path, required=True)
+    parser.add_argument(
+        "--predictions", type=Path, nargs="+", default=None,
+        help="One prediction directory, or several (one per model) with --model-labels",
+    )
+    parser.add_argument(
+        "--model-labels", type=str, nargs="+", default=None,
+        help="One label per --predictions directory (required for several)",
+    )
+    parser.add_argument("--references", type=Path, default=None)
+    parser.add_argument(
+        "--sources", type=str, nargs="+", default=None, metavar="NAME=DIR",
+        help="Matrix mode: score every label source against every other and "
+        "write a tidy Parquet (instead of --predictions/--references)",
+    )
     parser.add_argument("--mapping", type=Path, required=True, help="case_id_mapping.json")
-    parser.add_argument("--output", type=Path, required=True, help="Output CSV path")
+    parser.add_argument(
+        "--output", type=Path, required=True,
+        help="Output CSV path. With several models, include {model} for per-model CSVs; "
+        "otherwise one long CSV with a model column is written. Parquet with --sources",
+    )
     parser.add_argument("--split", type=str, default="test")
     parser.add_argument(
         "--metrics",
@@ -277,21 +984,90 @@ if __name__ == "__main__":
         choices=sorted(VALID_METRICS),
         help="Metrics to compute (default: dice only)",
     )
+    parser.add_argument(
+        "--nsd-tolerance",
+        type=float,
+        default=DEFAULT_NSD_TOLERANCE,
+        help=f"NSD boundary tolerance in mm (default: {DEFAULT_NSD_TOLERANCE})",
+    )
+    parser.add_argument(
+        "--volume-cache",
+        action="store_true",
+        help="Cache decoded label volumes as .npy under processed_dir/label_cache",
+    )
     parser.add_argument(
         "--workers",
         type=int,
         default=1,
         help="Parallel workers for evaluation (default: 1)",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip cases already checkpointed in <output>.parts/ by an interrupted run",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=VALID_BACKENDS,
+        default="numpy",
+        help="Overlap-count backend: numpy (default) or torch (multithreaded CPU)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="torch intra-op threads per worker with --backend torch",
+    )
     args = parser.parse_args()
-
     mapping_data = json.loads(args.mapping.read_text())
+
+    if args.sources is not None:
+        if args.predictions is not None or args.references is not None:
+            parser.error("--sources replaces --predictions/--references")
+        sources: dict[str, Path] = {}
+        for spec in args.sources:
+            name, sep, directory = spec.partition("=")
+            if not sep or not name or not directory:
+                parser.error(f"--sources entries must be NAME=DIR, got {spec!r}")
+            sources[name] = Path(directory)
+        evaluate_matrix(
+            sources=sources,
+            mapping=mapping_data,
+            output_path=args.output,
+            metrics=set(args.metrics),
+            split=args.split,
+            workers=args.workers,
+            nsd_tolerance=args.nsd_tolerance,
+            volume_cache=args.volume_cache,
+        )
+        raise SystemExit(0)
+
+    if args.predictions is None or args.references is None:
+        parser.error("--predictions and --references are required without --sources")
+
+    if args.model_labels is None:
+        if len(args.predictions) != 1:
+            parser.error("--model-labels is required with several --predictions")
+        predictions: Path | dict[str, Path] = args.predictions[0]
+    else:
+        if len(args.model_labels) != len(args.predictions):
+            parser.error(
+                f"Got {len(args.predictions)} --predictions but "
+                f"{len(args.model_labels)} --model-labels"
+            )
+        predictions = dict(zip(args.model_labels, args.predictions))
+
     evaluate_folder(
-        pred_dir=args.predictions,
+        pred_dir=predictions,
         ref_dir=args.references,
         mapping=mapping_data,
         output_path=args.output,
         metrics=set(args.metrics),
         split=args.split,
         workers=args.workers,
+        nsd_tolerance=args.nsd_tolerance,
+        volume_cache=args.volume_cache,
+        resume=args.resume,
+        backend=args.backend,
+        threads=args.threads,
     )
@@ -1,7 +1,10 @@
 """Pure fairness metric functions.
 
 All functions take a Polars DataFrame + column names and return
-JSON-serializable dicts or floats. No I/O, no matplotlib.
+JSON-serializable dicts or floats. No I/O, no matplotlib. Instead of a frame,
+the per-group functions also accept a ``resampling.GroupedScores`` (valid
+scores + integer group codes, built once per cell by analyze.py's per-ruler
+cache); the column names are then ignored.
 
 Convention: score_col is a performance metric (higher = better for Dice and
 nDSC, lower = better for HD95). DPD and DIR follow the canonical fairness
@@ -19,14 +22,48 @@ adverse impact under the four-fifths rule (valid because DIR is a rate ratio).
 
 from __future__ import annotations
 
-from typing import Callable
+import warnings
+from collections.abc import Callable
 
 import numpy as np
 import polars as pl
 from scipy import stats as sp_stats
+from scipy.special import fdtrc, ndtr, stdtr, stdtrit
 from statsmodels.stats.multitest import multipletests
 
-from src.eda.stats import kruskal_result, mann_whitney_result
+from src.eda.stats import dunn_pairs, kruskal_h
+from src.fairness.resampling import (
+    EXACT_MAX_GROUPS,
+    GroupedScores,
+    GroupOutcomes,
+    bca_interval,
+    bootstrap_batches,
+    bootstrap_sweep_rates,
+    encode_outcomes,
+    exact_permutation_null,
+    group_rates,
+    group_scores,
+    jackknife_statistics,
+    percentile_interval,
+    permutation_batches,
+    permutation_null,
+    rate_statistics,
+    resample_statistics,
+    sort_scores,
+    sweep_rates,
+)
+
+
+def _grouped(
+    df: pl.DataFrame | GroupedScores,
+    score_col: str,
+    group_col: str,
+    cluster_col: str | None = None,
+) -> GroupedScores:
+    """Valid scores and group codes of a cell; a GroupedScores passes through."""
+    if isinstance(df, GroupedScores):
+        return df
+    return group_scores(df, score_col, group_col, cluster_col)
 
 
 # ---------------------------------------------------------------------------
@@ -34,22 +71,58 @@ from src.eda.stats import kruskal_result, mann_whitney_result
 # ---------------------------------------------------------------------------
 
 
-def group_summary(df: pl.DataFrame, score_col: str, group_col: str) -> pl.DataFrame:
-    """Per-group descriptive statistics, sorted by group name."""
-    return (
-        df.group_by(group_col)
-        .agg(
-            pl.col(score_col).count().alias("n"),
-            pl.col(score_col).mean().alias("mean"),
-            pl.col(score_col).median().alias("median"),
-            pl.col(score_col).std().alias("std"),
-            pl.col(score_col).quantile(0.25).alias("q25"),
-            pl.col(score_col).quantile(0.75).alias("q75"),
-        )
-        .with_columns((pl.col("q75") - pl.col("q25")).alias("iqr"))
-        .rename({group_col: "group"})
-        .sort("group")
-    )
+def group_summary(
+    df: pl.DataFrame | GroupedScores, score_col: str, group_col: str
+) -> pl.DataFrame:
+    """Per-group descriptive statistics of the valid (non-NaN) scores, sorted by group.
+
+    Computed from one per-group sort: quantiles use nearest-rank like Polars'
+    default ``quantile``; std is the sample std (null below two cases). A group
+    whose scores are all NaN/null keeps its row with n=0 and NaN statistics.
+    """
+    grouped = _grouped(df, score_col, group_col)
+    sorted_scores = sort_scores(grouped)
+    scores, offsets = sorted_scores.scores, sorted_scores.offsets
+    counts = np.diff(offsets)
+    start = offsets[:-1]
+
+    def _nearest(q: float) -> np.ndarray:
+        return scores[start + np.floor((counts - 1) * q + 0.5).astype(np.intp)]
+
+    lo = scores[start + (counts - 1) // 2]
+    hi = scores[start + counts // 2]
+    mean = np.add.reduceat(scores, start) / counts
+    sq_dev = np.add.reduceat((scores - np.repeat(mean, counts)) ** 2, start)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.where(counts > 1, np.sqrt(sq_dev / (counts - 1)), np.nan)
+    stats = {
+        "mean": mean,
+        "median": lo + (hi - lo) * 0.5,
+        "std": std,
+        "q25": _nearest(0.25),
+        "q75": _nearest(0.75),
+    }
+
+    # Scatter the present groups into every group of the grouping
+    groups = grouped.all_groups or grouped.groups
+    position = {g: i for i, g in enumerate(groups)}
+    rows = np.array([position[g] for g in grouped.groups], dtype=np.intp)
+    n = np.zeros(len(groups), dtype=np.uint32)
+    n[rows] = counts
+    columns = {}
+    for name, values in stats.items():
+        columns[name] = np.full(len(groups), np.nan)
+        columns[name][rows] = values
+
+    return pl.DataFrame({
+        "group": groups,
+        "n": n,
+        "mean": columns["mean"],
+        "median": columns["median"],
+        "std": pl.Series(columns["std"], dtype=pl.Float64, nan_to_null=True),
+        "q25": columns["q25"],
+        "q75": columns["q75"],
+    }).with_columns((pl.col("q75") - pl.col("q25")).alias("iqr"))
 
 
 # ---------------------------------------------------------------------------
@@ -58,7 +131,7 @@ def group_summary(df: pl.DataFrame, score_col: str, group_col: str) -> pl.DataFr
 
 
 def _group_rates(
-    df: pl.DataFrame,
+    df: pl.DataFrame | GroupedScores,
     score_col: str,
     group_col: str,
     threshold: float,
@@ -68,28 +141,18 @@ def _group_rates(
 
     The beneficial outcome ("success") is ``score > threshold`` when
     higher_is_better (Dice, nDSC) and ``score < threshold`` otherwise (HD95,
-    lower-is-better). Returns the fraction of valid cases per group that succeed.
+    lower-is-better). Returns the fraction of valid cases per group that
+    succeed, in sorted group order (ties for best/worst: first group wins).
     """
-    clean = df.filter(pl.col(score_col).is_not_null() & pl.col(score_col).is_not_nan())
-    success = (
-        pl.col(score_col) > threshold
-        if higher_is_better
-        else pl.col(score_col) < threshold
+    outcomes = encode_outcomes(
+        _grouped(df, score_col, group_col), threshold, higher_is_better
     )
-    rows = (
-        clean.with_columns(success.cast(pl.Float64).alias("_success"))
-        .group_by(group_col)
-        .agg(pl.col("_success").mean().alias("rate"))
-        .to_dicts()
-    )
-    if not rows:
-        msg = f"No valid scores in {score_col} for any group"
-        raise ValueError(msg)
-    return {r[group_col]: float(r["rate"]) for r in rows}
+    rates = group_rates(outcomes)
+    return {g: float(r) for g, r in zip(outcomes.groups, rates)}
 
 
 def disparate_impact_ratio(
-    df: pl.DataFrame,
+    df: pl.DataFrame | GroupedScores,
     score_col: str,
     group_col: str,
     threshold: float = 0.8,
@@ -109,7 +172,7 @@ def disparate_impact_ratio(
 
 
 def demographic_parity_difference(
-    df: pl.DataFrame,
+    df: pl.DataFrame | GroupedScores,
     score_col: str,
     group_col: str,
     threshold: float = 0.8,
@@ -121,7 +184,7 @@ def demographic_parity_difference(
 
 
 def fairness_gap(
-    df: pl.DataFrame,
+    df: pl.DataFrame | GroupedScores,
     score_col: str,
     group_col: str,
     threshold: float = 0.8,
@@ -150,7 +213,7 @@ def fairness_gap(
 
 
 def dir_sensitivity(
-    df: pl.DataFrame,
+    df: pl.DataFrame | GroupedScores,
     score_col: str,
     group_col: str,
     thresholds: list[float],
@@ -161,60 +224,242 @@ def dir_sensitivity(
     Guards against a near-degenerate cutoff: with high Dice (~0.89) the success
     rate at 0.8 can be near 1.0, so reviewers should confirm the verdict holds
     across thresholds.
+
+    Scores are sorted once per group (``resampling.sort_scores``); the rates at
+    every threshold then come from ``np.searchsorted``, so dense grids cost
+    about the same as a handful of cutoffs. Ties for best/worst group go to
+    the first group in sorted order.
     """
-    rows = []
-    for t in thresholds:
-        gap = fairness_gap(df, score_col, group_col, threshold=t, higher_is_better=higher_is_better)
-        rows.append({
-            "threshold": float(t),
-            "dir": gap["dir"],
-            "dpd": gap["dpd"],
-            "best_group": gap["best_group"],
-            "worst_group": gap["worst_group"],
-            "best_rate": gap["best_rate"],
-            "worst_rate": gap["worst_rate"],
-        })
-    return pl.DataFrame(rows)
+    sorted_scores = sort_scores(_grouped(df, score_col, group_col))
+    rates = sweep_rates(sorted_scores, np.asarray(thresholds), higher_is_better)
+    stats = rate_statistics(rates, ("dir", "dpd", "best_rate", "worst_rate"), [])
+    groups = sorted_scores.groups
+    best_idx = np.argmax(rates, axis=1)
+    worst_idx = np.argmin(rates, axis=1)
+
+    return pl.DataFrame({
+        "threshold": [float(t) for t in thresholds],
+        "dir": stats["dir"].astype(float),
+        "dpd": stats["dpd"].astype(float),
+        "best_group": [groups[i] for i in best_idx],
+        "worst_group": [groups[i] for i in worst_idx],
+        "best_rate": stats["best_rate"].astype(float),
+        "worst_rate": stats["worst_rate"].astype(float),
+    })
+
+
+def dir_curve(
+    df: pl.DataFrame | GroupedScores,
+    score_col: str,
+    group_col: str,
+    thresholds: list[float] | np.ndarray,
+    higher_is_better: bool = True,
+    n_boot: int = 10_000,
+    alpha: float = 0.05,
+    seed: int | None = None,
+) -> pl.DataFrame:
+    """DIR/DPD-vs-threshold curve with pointwise percentile bootstrap bands.
+
+    Meant for dense grids (hundreds of cutoffs). Every resample is a vector of
+    case multiplicities applied to the same per-group sorted scores
+    (``resampling.bootstrap_sweep_rates``), so the whole curve is rescored per
+    resample without re-sorting or re-binarizing.
+
+    Returns one row per threshold: dir, dir_low, dir_high, dpd, dpd_low,
+    dpd_high (bands at ``alpha``; NaN where a statistic is undefined in
+    every resample).
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    sorted_scores = sort_scores(_grouped(df, score_col, group_col))
+    rng = np.random.default_rng(seed)
+
+    point = rate_statistics(
+        sweep_rates(sorted_scores, thresholds, higher_is_better), ("dir", "dpd"), []
+    )
+    boot = rate_statistics(
+        bootstrap_sweep_rates(sorted_scores, thresholds, higher_is_better, n_boot, rng),
+        ("dir", "dpd"),
+        [],
+    )
+
+    columns: dict[str, np.ndarray] = {"threshold": thresholds}
+    for name in ("dir", "dpd"):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN thresholds
+            low, high = np.nanpercentile(
+                boot[name], [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0
+            )
+        columns[name] = point[name].astype(float)
+        columns[f"{name}_low"] = low
+        columns[f"{name}_high"] = high
+    return pl.DataFrame(columns)
 
 
 # ---------------------------------------------------------------------------
-# Statistical tests (wrappers around src.eda.stats)
+# Statistical tests (batched rank tests)
 # ---------------------------------------------------------------------------
 
 
-def _extract_groups(
-    df: pl.DataFrame, score_col: str, group_col: str
-) -> dict[str, np.ndarray]:
-    """Extract per-group score arrays, dropping NaN values."""
-    clean = df.filter(pl.col(score_col).is_not_null() & pl.col(score_col).is_not_nan())
-    groups: dict[str, np.ndarray] = {}
-    for name in sorted(clean[group_col].unique().to_list()):
-        arr = clean.filter(pl.col(group_col) == name)[score_col].to_numpy()
-        if len(arr) > 0:
-            groups[name] = arr
-    return groups
-
-
-def mann_whitney_test(df: pl.DataFrame, score_col: str, group_col: str) -> dict:
-    """Mann-Whitney U for exactly two groups. Delegates to src.eda.stats."""
-    groups = _extract_groups(df, score_col, group_col)
-    names = sorted(groups.keys())
-    if len(names) != 2:
-        msg = f"Expected 2 groups for Mann-Whitney, got {len(names)}: {names}"
+def mann_whitney_test(
+    df: pl.DataFrame | GroupedScores, score_col: str, group_col: str
+) -> dict:
+    """Mann-Whitney U for exactly two groups (``rank_tests`` on one column)."""
+    grouped = _grouped(df, score_col, group_col)
+    if grouped.n_groups != 2:
+        msg = f"Expected 2 groups for Mann-Whitney, got {grouped.n_groups}: {grouped.groups}"
         raise ValueError(msg)
-    result = mann_whitney_result(groups[names[0]], groups[names[1]])
-    result["group_a"] = names[0]
-    result["group_b"] = names[1]
-    return result
+    return rank_tests(grouped.scores[:, None], grouped.codes, grouped.groups)[0]
 
 
-def kruskal_wallis_test(df: pl.DataFrame, score_col: str, group_col: str) -> dict:
-    """Kruskal-Wallis H for 3+ groups. Delegates to src.eda.stats."""
-    groups = _extract_groups(df, score_col, group_col)
-    if len(groups) < 3:
-        msg = f"Expected 3+ groups for Kruskal-Wallis, got {len(groups)}"
+def kruskal_wallis_test(
+    df: pl.DataFrame | GroupedScores,
+    score_col: str,
+    group_col: str,
+    p_adjust: str = "bonferroni",
+) -> dict:
+    """Kruskal-Wallis H for 3+ groups (``rank_tests`` on one column)."""
+    grouped = _grouped(df, score_col, group_col)
+    if grouped.n_groups < 3:
+        msg = f"Expected 3+ groups for Kruskal-Wallis, got {grouped.n_groups}"
         raise ValueError(msg)
-    return kruskal_result(groups)
+    return rank_tests(
+        grouped.scores[:, None], grouped.codes, grouped.groups, p_adjust=p_adjust
+    )[0]
+
+
+def rank_tests(
+    values: np.ndarray, codes: np.ndarray, groups: list, p_adjust: str = "bonferroni"
+) -> list[dict]:
+    """Rank tests of group differences for every column of ``values`` at once.
+
+    ``values`` is ``(n, m)``: one row per case, one column per score, NaN
+    where a case has no valid score; ``codes[i]`` indexes ``groups`` (-1
+    drops the row). All columns are ranked in one ``rankdata(axis=0)`` call.
+    Group rank sums and sizes are one matrix product of the group one-hot
+    with the ranks, and the tie terms come from one bincount over the runs
+    of the column-wise sort.
+
+    Each column is tested on the groups that have a valid score in it:
+    Mann-Whitney U for two (as ``eda.stats.mann_whitney_result``, plus
+    ``group_a`` / ``group_b``), Kruskal-Wallis H with Dunn's post-hoc
+    (``p_adjust``: "bonferroni" or "holm") for three or more (as
+    ``eda.stats.kruskal_result``). The post-hoc reuses the rank sums and tie
+    term of the H statistic, so no column is ranked twice. Statistics and
+    p-values follow scipy (asymptotic with tie and continuity correction; the
+    exact Mann-Whitney null is delegated to scipy for small tie-free samples).
+
+    Raises ValueError if a column has fewer than two groups.
+    """
+    keep = codes >= 0
+    values = np.asarray(values, dtype=float)[keep]
+    codes = codes[keep]
+    valid = ~np.isnan(values)
+    n_rows, n_cols = values.shape
+
+    ranks = sp_stats.rankdata(values, axis=0, nan_policy="omit")
+    one_hot = np.zeros((len(groups), n_rows))
+    one_hot[codes, np.arange(n_rows)] = 1.0
+    sizes = one_hot @ valid
+    rank_sums = one_hot @ np.where(valid, ranks, 0.0)
+
+    # Tie runs of every column: NaN sorts last and each NaN starts its own
+    # (zero-weight) run, so only valid values are counted
+    ordered = np.sort(values, axis=0)
+    new_run = np.ones(ordered.shape, dtype=bool)
+    new_run[1:] = ordered[1:] != ordered[:-1]
+    run = np.cumsum(new_run, axis=0) - 1 + np.arange(n_cols) * n_rows
+    t = np.bincount(
+        run.ravel(), weights=(~np.isnan(ordered)).ravel(), minlength=n_rows * n_cols
+    ).reshape(n_cols, n_rows)
+    tie_terms = (t**3 - t).sum(axis=1)
+    n_distinct = (t > 0).sum(axis=1)
+
+    results = []
+    for j in range(n_cols):
+        present = np.flatnonzero(sizes[:, j])
+        samples = {groups[g]: values[(codes == g) & valid[:, j], j] for g in present}
+        if len(present) < 2:
+            msg = f"Expected 2+ groups with valid scores in column {j}, got {len(present)}"
+            raise ValueError(msg)
+        if len(present) == 2:
+            results.append(_mann_whitney(
+                samples, rank_sums[present, j], t[j], tie_terms[j], n_distinct[j]
+            ))
+        else:
+            results.append(_kruskal(
+                samples, rank_sums[present, j], sizes[present, j], tie_terms[j],
+                n_distinct[j], p_adjust,
+            ))
+    return results
+
+
+def _mann_whitney(
+    samples: dict[str, np.ndarray],
+    rank_sums: np.ndarray,
+    ties: np.ndarray,
+    tie_term: float,
+    n_distinct: int,
+) -> dict:
+    """Mann-Whitney U result (scipy two-sided, method="auto") from rank sums."""
+    (name_a, a), (name_b, b) = samples.items()
+    n_a, n_b = a.size, b.size
+    if n_distinct <= 1:
+        # All observations identical: no detectable difference (as in eda.stats)
+        U, p, r_rb = float("nan"), 1.0, 0.0
+    else:
+        U = rank_sums[0] - n_a * (n_a + 1) / 2
+        if (n_a <= 8 or n_b <= 8) and not (ties > 1).any():
+            p = sp_stats.mannwhitneyu(a, b, alternative="two-sided", method="exact").pvalue
+        else:
+            n = n_a + n_b
+            s = np.sqrt(n_a * n_b / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+            centered = U - n_a * n_b / 2
+            z = (centered - 0.5 * np.sign(centered)) / s
+            p = min(2 * ndtr(-abs(z)), 1.0)
+        r_rb = 1.0 - (2.0 * U) / (n_a * n_b)
+    return {
+        "test": "mann_whitney",
+        "U": float(U),
+        "p": float(p),
+        "r_rb": float(r_rb),
+        "median_a": float(np.median(a)),
+        "median_b": float(np.median(b)),
+        "n_a": int(n_a),
+        "n_b": int(n_b),
+        "group_a": name_a,
+        "group_b": name_b,
+    }
+
+
+def _kruskal(
+    samples: dict[str, np.ndarray],
+    rank_sums: np.ndarray,
+    sizes: np.ndarray,
+    tie_term: float,
+    n_distinct: int,
+    p_adjust: str,
+) -> dict:
+    """Kruskal-Wallis H result with Dunn's post-hoc, both from the rank sums."""
+    k = len(samples)
+    n = sizes.sum()
+    if n_distinct <= 1:
+        # All observations identical: no detectable difference (as in eda.stats)
+        H, p, epsilon_sq = float("nan"), 1.0, 0.0
+    else:
+        H, p = kruskal_h(rank_sums, sizes, tie_term)
+        epsilon_sq = (H - k + 1) / (n - k)
+    return {
+        "test": "kruskal_wallis",
+        "H": float(H),
+        "p": float(p),
+        "epsilon_sq": float(epsilon_sq),
+        "posthoc": (
+            dunn_pairs(list(samples), rank_sums, sizes, tie_term, p_adjust)
+            if p < 0.05 else []
+        ),
+        "medians": {name: float(np.median(a)) for name, a in samples.items()},
+        "ns": {name: int(a.size) for name, a in samples.items()},
+    }
 
 
 def apply_fdr(p_values: list[float], method: str = "fdr_bh") -> list[float]:
@@ -235,48 +480,127 @@ def ols_regression(
 ) -> dict:
     """OLS regression of score_col on covariates.
 
-    Categorical covariates (string dtype) are one-hot encoded.
+    Categorical covariates (non-numeric dtype) are one-hot encoded.
     Returns coefficients, R-squared, F-stat, and per-coefficient CIs.
+    Single-response form of ``ols_regressions``.
     """
-    import statsmodels.api as sm
+    return ols_regressions(df, [score_col], covariates)[score_col]
+
+
+def ols_regressions(
+    df: pl.DataFrame, score_cols: list[str], covariates: list[str], alpha: float = 0.05
+) -> dict[str, dict]:
+    """OLS regressions of several responses on the same covariates.
 
-    clean = df.select([score_col, *covariates]).drop_nulls().drop_nans()
-    pdf = clean.to_pandas()
+    Each response uses the rows where it and every covariate are valid, i.e.
+    non-null and finite (listwise deletion, as in a separate fit). Responses with the same valid
+    rows share one design matrix (``_ols_design``), usually all of them, and
+    are solved together in one ``np.linalg.lstsq`` call. Standard errors,
+    t-tests and ``1 - alpha`` CIs for every coefficient of every response are
+    computed in one vectorized step. Matches statsmodels ``OLS().fit()``.
 
-    y = pdf[score_col]
-    X_parts = []
+    Raises ValueError if a response has no rows left.
+    """
+    frame = df.select([*covariates, *score_cols])
+    complete = np.ones(frame.height, dtype=bool)
     for cov in covariates:
-        if not __import__("pandas").api.types.is_numeric_dtype(pdf[cov]):
-            dummies = pdf[[cov]].astype(str)
-            dummies = __import__("pandas").get_dummies(dummies, drop_first=True, dtype=float)
-            X_parts.append(dummies)
-        else:
-            X_parts.append(pdf[[cov]].astype(float))
-
-    X = __import__("pandas").concat(X_parts, axis=1)
-    X = sm.add_constant(X)
-
-    model = sm.OLS(y, X).fit()
-
-    coefficients = {}
-    for name in model.params.index:
-        ci = model.conf_int().loc[name]
-        coefficients[name] = {
-            "coef": float(model.params[name]),
-            "se": float(model.bse[name]),
-            "p": float(model.pvalues[name]),
-            "ci_low": float(ci[0]),
-            "ci_high": float(ci[1]),
-        }
+        complete &= _valid_mask(frame[cov])
+    masks = {col: complete & _valid_mask(frame[col]) for col in score_cols}
+
+    results: dict[str, dict] = {}
+    patterns: dict[bytes, list[str]] = {}
+    for col, mask in masks.items():
+        patterns.setdefault(np.packbits(mask).tobytes(), []).append(col)
+    for cols in patterns.values():
+        rows = frame.filter(pl.Series(masks[cols[0]]))
+        if rows.height == 0:
+            msg = f"No complete rows for OLS of {cols[0]} on {covariates}"
+            raise ValueError(msg)
+        X, names = _ols_design(rows, covariates)
+        Y = np.column_stack([rows[col].cast(pl.Float64).to_numpy() for col in cols])
+        results.update(zip(cols, _ols_fit(X, Y, names, alpha)))
+    return {col: results[col] for col in score_cols}
+
+
+def _valid_mask(series: pl.Series) -> np.ndarray:
+    """Rows that are neither null nor (for float columns) NaN or infinite.
+
+    HD95 is inf when a label is missed; such rows cannot enter a least-squares
+    fit, and one inf in a shared solve would turn every response into NaN.
+    """
+    mask = series.is_not_null()
+    if series.dtype.is_float():
+        mask &= series.is_finite().fill_null(False)
+    return mask.to_numpy()
 
-    return {
-        "r_squared": float(model.rsquared),
-        "adj_r_squared": float(model.rsquared_adj),
-        "f_stat": float(model.fvalue),
-        "f_pvalue": float(model.f_pvalue),
-        "coefficients": coefficients,
-        "n": int(model.nobs),
-    }
+
+def _ols_design(rows: pl.DataFrame, covariates: list[str]) -> tuple[np.ndarray, list[str]]:
+    """Design matrix with a leading constant, built from Polars columns.
+
+    Numeric (and boolean) covariates enter as is. Any other covariate is
+    one-hot encoded over its sorted levels with the first level dropped, one
+    column ``<cov>_<level>`` per remaining level (``pandas.get_dummies(...,
+    drop_first=True)`` naming).
+    """
+    columns = [np.ones(rows.height)]
+    names = ["const"]
+    for cov in covariates:
+        series = rows[cov]
+        if series.dtype.is_numeric() or series.dtype == pl.Boolean:
+            columns.append(series.cast(pl.Float64).to_numpy())
+            names.append(cov)
+            continue
+        values = series.cast(pl.String).to_numpy()
+        levels, codes = np.unique(values, return_inverse=True)
+        for j, level in enumerate(levels[1:], start=1):
+            columns.append((codes == j).astype(float))
+            names.append(f"{cov}_{level}")
+    return np.column_stack(columns), names
+
+
+def _ols_fit(X: np.ndarray, Y: np.ndarray, names: list[str], alpha: float) -> list[dict]:
+    """Fit every column of ``Y`` on ``X`` at once; one result dict per column."""
+    n = X.shape[0]
+    beta, _, rank, _ = np.linalg.lstsq(X, Y, rcond=None)
+    resid = Y - X @ beta
+    rss = np.sum(resid**2, axis=0)
+    tss = np.sum((Y - Y.mean(axis=0)) ** 2, axis=0)
+    df_resid = n - rank
+    df_model = rank - 1
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # diag of pinv(X) pinv(X)^T, statsmodels' normalized covariance (shared)
+        unscaled = np.sum(np.linalg.pinv(X) ** 2, axis=1)
+        se = np.sqrt(unscaled[:, None] * (rss / df_resid))
+        t = beta / se
+        p = 2 * stdtr(df_resid, -np.abs(t))
+        half_width = stdtrit(df_resid, 1 - alpha / 2) * se
+
+        r_squared = 1 - rss / tss
+        adj_r_squared = 1 - (n - 1) / df_resid * (1 - r_squared)
+        f_stat = ((tss - rss) / df_model) / (rss / df_resid)
+        f_pvalue = fdtrc(df_model, df_resid, f_stat)
+
+    return [
+        {
+            "r_squared": float(r_squared[j]),
+            "adj_r_squared": float(adj_r_squared[j]),
+            "f_stat": float(f_stat[j]),
+            "f_pvalue": float(f_pvalue[j]),
+            "coefficients": {
+                name: {
+                    "coef": float(beta[i, j]),
+                    "se": float(se[i, j]),
+                    "p": float(p[i, j]),
+                    "ci_low": float(beta[i, j] - half_width[i, j]),
+                    "ci_high": float(beta[i, j] + half_width[i, j]),
+                }
+                for i, name in enumerate(names)
+            },
+            "n": int(n),
+        }
+        for j in range(Y.shape[1])
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -284,114 +608,439 @@ def ols_regression(
 # ---------------------------------------------------------------------------
 
 
+MetricFn = Callable[[pl.DataFrame, str, str], float]
+
+
 def bootstrap_ci(
-    df: pl.DataFrame,
+    df: pl.DataFrame | GroupedScores,
     score_col: str,
     group_col: str,
-    metric_fn: Callable[[pl.DataFrame, str, str], float],
+    statistic: str | MetricFn = "dir",
+    threshold: float = 0.8,
+    higher_is_better: bool = True,
     n_boot: int = 10_000,
     alpha: float = 0.05,
     seed: int | None = None,
+    sequential: bool = False,
+    tol: float = 0.005,
+    batch: int = 1_000,
+    resample: str = "case",
+    cluster_col: str | None = None,
 ) -> dict:
-    """BCa bootstrap confidence interval for a fairness metric.
+    """BCa bootstrap confidence interval for one statistic (DIR by default).
 
-    Uses scipy.stats.bootstrap (BCa method). Falls back to percentile
-    if BCa returns NaN (degenerate distributions).
+    Single-statistic form of ``bootstrap_cis``; see there. ``statistic`` may
+    also be a ``metric_fn(df, score_col, group_col) -> float`` callable (the
+    former signature): it is then evaluated on every resampled frame through
+    ``scipy.stats.bootstrap``, which is far slower and supports neither
+    sequential stopping nor other resampling schemes.
     """
+    if callable(statistic):
+        if sequential or resample != "case":
+            msg = "A metric_fn statistic supports only fixed case resampling"
+            raise ValueError(msg)
+        return _bootstrap_ci_generic(df, score_col, group_col, statistic, n_boot, alpha, seed)
+    if statistic == "group_rates":
+        msg = "Use bootstrap_cis for group_rates (one CI per group)"
+        raise ValueError(msg)
+    return bootstrap_cis(
+        df, score_col, group_col, (statistic,),
+        threshold=threshold, higher_is_better=higher_is_better,
+        n_boot=n_boot, alpha=alpha, seed=seed,
+        sequential=sequential, tol=tol, batch=batch,
+        resample=resample, cluster_col=cluster_col,
+    )[statistic]
+
+
+def bootstrap_cis(
+    df: pl.DataFrame | GroupedScores,
+    score_col: str,
+    group_col: str,
+    statistics: tuple[str, ...] = ("dir", "dpd"),
+    threshold: float = 0.8,
+    higher_is_better: bool = True,
+    n_boot: int = 10_000,
+    alpha: float = 0.05,
+    seed: int | None = None,
+    sequential: bool = False,
+    tol: float = 0.005,
+    batch: int = 1_000,
+    resample: str = "case",
+    cluster_col: str | None = None,
+) -> dict[str, dict]:
+    """BCa bootstrap confidence intervals for several rate statistics at once.
+
+    Native BCa (``resampling.bca_interval``, same draws and interval as
+    scipy.stats.bootstrap). The acceleration term uses leave-one-out
+    statistics from closed-form per-group count updates
+    (``resampling.jackknife_statistics``) instead of ``n`` re-evaluations.
+    A statistic whose BCa interval is NaN (degenerate distribution) falls
+    back to the percentile interval of the same bootstrap distribution.
+
+    Cases are encoded once as group codes plus a success vector
+    (``resampling.encode_outcomes``). Each resample's per-group rates are
+    computed once and every statistic in ``statistics`` (see
+    ``resampling.STATISTICS``: dir, dpd, best_rate, worst_rate, group_rates)
+    is read off them, so all CIs come from the same resamples in one
+    vectorized pass.
+
+    ``resample`` picks the resampling unit (``resampling.RESAMPLING_SCHEMES``):
+    i.i.d. cases (default), cases within each group ("stratified", so no
+    group ever drops out of a resample), or whole clusters ("cluster", e.g.
+    all exams of a patient; cluster ids come from ``cluster_col`` or from a
+    GroupedScores' ``clusters``). The jackknife leaves out the same unit.
+
+    With ``sequential=True``, ``n_boot`` is an upper bound: resamples are
+    added ``batch`` at a time (extending the same bootstrap distribution) and
+    drawing stops once no CI endpoint of any statistic moved by more than
+    ``tol`` over the last batch.
+
+    Returns one CI dict per statistic name (``rate_<group>`` for group_rates),
+    with ``n_boot`` the number of resamples actually used, ``n_boot_max`` the
+    budget, ``stopping`` the rule that ended the run ("fixed",
+    "ci_stable", or "max_resamples"), and ``resample`` the scheme.
+    """
+    outcomes = encode_outcomes(
+        _grouped(df, score_col, group_col, cluster_col), threshold, higher_is_better
+    )
+    rng = np.random.default_rng(seed)
+
+    point = resample_statistics(outcomes, None, statistics)
+    jackknife = jackknife_statistics(outcomes, statistics, scheme=resample)
+    names = list(point)
+
+    drawn: dict[str, list[np.ndarray]] = {name: [] for name in names}
+    used = 0
+    stopping = "fixed" if not sequential else "max_resamples"
+    intervals = None
+    step = n_boot if not sequential else batch
+    for values in bootstrap_batches(
+        outcomes, statistics, n_boot, rng, batch=step, scheme=resample
+    ):
+        for name in names:
+            drawn[name].append(values[name])
+        used += len(values[names[0]])
+
+        previous = intervals
+        intervals = {
+            name: _bca_or_percentile(
+                np.concatenate(drawn[name]), point[name], jackknife[name], alpha
+            )
+            for name in names
+        }
+        if previous is not None and max(
+            _max_shift(np.array(previous[name][:2]), np.array(intervals[name][:2]))
+            for name in names
+        ) <= tol:
+            stopping = "ci_stable"
+            break
+
+    return {
+        name: {
+            "point_estimate": float(point[name]),
+            "ci_low": intervals[name][0],
+            "ci_high": intervals[name][1],
+            "alpha": alpha,
+            "n_boot": used,
+            "n_boot_max": n_boot,
+            "method": intervals[name][2],
+            "stopping": stopping,
+            "resample": resample,
+        }
+        for name in names
+    }
+
+
+def _bootstrap_ci_generic(
+    df: pl.DataFrame,
+    score_col: str,
+    group_col: str,
+    metric_fn: MetricFn,
+    n_boot: int,
+    alpha: float,
+    seed: int | None,
+) -> dict:
+    """``bootstrap_ci`` for an arbitrary ``metric_fn``: scipy BCa over resampled frames."""
     clean = df.filter(pl.col(score_col).is_not_null() & pl.col(score_col).is_not_nan())
-    n = clean.height
     rng = np.random.default_rng(seed)
 
     def _statistic(indices: np.ndarray) -> float:
-        sample = clean[indices.astype(int).tolist()]
-        return metric_fn(sample, score_col, group_col)
+        return metric_fn(clean[indices.astype(int).tolist()], score_col, group_col)
 
-    point_estimate = metric_fn(clean, score_col, group_col)
-
-    indices = (np.arange(n),)
-    try:
-        result = sp_stats.bootstrap(
-            indices,
-            statistic=_statistic,
-            n_resamples=n_boot,
-            confidence_level=1 - alpha,
-            method="BCa",
-            random_state=rng,
-        )
-        ci_low = float(result.confidence_interval.low)
-        ci_high = float(result.confidence_interval.high)
-        method = "bca"
-    except Exception:
+    def _interval(method: str) -> tuple[float, float]:
         result = sp_stats.bootstrap(
-            indices,
+            (np.arange(clean.height),),
             statistic=_statistic,
             n_resamples=n_boot,
             confidence_level=1 - alpha,
-            method="percentile",
-            random_state=rng,
+            method=method,
+            rng=rng,
         )
-        ci_low = float(result.confidence_interval.low)
-        ci_high = float(result.confidence_interval.high)
-        method = "percentile"
+        return float(result.confidence_interval.low), float(result.confidence_interval.high)
 
+    method = "bca"
+    try:
+        ci_low, ci_high = _interval("BCa")
+    except Exception:
+        ci_low = ci_high = float("nan")
     if np.isnan(ci_low) or np.isnan(ci_high):
-        result = sp_stats.bootstrap(
-            indices,
-            statistic=_statistic,
-            n_resamples=n_boot,
-            confidence_level=1 - alpha,
-            method="percentile",
-            random_state=rng,
-        )
-        ci_low = float(result.confidence_interval.low)
-        ci_high = float(result.confidence_interval.high)
         method = "percentile"
+        ci_low, ci_high = _interval("percentile")
 
     return {
-        "point_estimate": float(point_estimate),
+        "point_estimate": float(metric_fn(clean, score_col, group_col)),
         "ci_low": ci_low,
         "ci_high": ci_high,
         "alpha": alpha,
         "n_boot": n_boot,
+        "n_boot_max": n_boot,
         "method": method,
+        "stopping": "fixed",
+        "resample": "case",
     }
 
 
+def _bca_or_percentile(
+    distribution: np.ndarray, estimate: float, jackknife: np.ndarray, alpha: float
+) -> tuple[float, float, str]:
+    """BCa interval, or the percentile interval of the same draws if BCa is NaN."""
+    low, high = bca_interval(distribution, estimate, jackknife, alpha)
+    if np.isnan(low) or np.isnan(high):
+        return (*percentile_interval(distribution, alpha), "percentile")
+    return low, high, "bca"
+
+
+def _max_shift(before: np.ndarray, after: np.ndarray) -> float:
+    """Largest endpoint change; NaN on both sides counts as no change, on one side as inf."""
+    both_nan = np.isnan(before) & np.isnan(after)
+    shift = np.where(both_nan, 0.0, np.abs(after - before))
+    return float(np.nan_to_num(shift, nan=np.inf).max(initial=0.0))
+
+
 def permutation_test(
-    df: pl.DataFrame,
+    df: pl.DataFrame | GroupedScores,
     score_col: str,
     group_col: str,
-    metric_fn: Callable[[pl.DataFrame, str, str], float],
+    statistic: str | MetricFn = "dir",
+    threshold: float = 0.8,
+    higher_is_better: bool = True,
     n_perm: int = 10_000,
     seed: int | None = None,
+    sequential: bool = False,
+    alpha: float = 0.05,
+    confidence: float = 0.99,
+    batch: int = 200,
+    exact: bool | None = None,
 ) -> dict:
-    """Permutation test: is the observed metric significantly different from chance?
+    """Permutation test for one statistic (DIR by default).
 
-    Shuffles group labels n_perm times, computes metric_fn each time.
+    Single-statistic form of ``permutation_tests``; see there. ``statistic``
+    may also be a ``metric_fn(df, score_col, group_col) -> float`` callable
+    (the former signature): it is then evaluated on ``n_perm`` frames with
+    shuffled group labels, one at a time (Monte Carlo only, no sequential
+    stopping).
     """
+    if callable(statistic):
+        if sequential or exact:
+            msg = "A metric_fn statistic supports only fixed Monte Carlo shuffles"
+            raise ValueError(msg)
+        return _permutation_test_generic(df, score_col, group_col, statistic, n_perm, seed)
+    if statistic == "group_rates":
+        msg = "Use permutation_tests for group_rates (one test per group)"
+        raise ValueError(msg)
+    return permutation_tests(
+        df, score_col, group_col, (statistic,),
+        threshold=threshold, higher_is_better=higher_is_better,
+        n_perm=n_perm, seed=seed,
+        sequential=sequential, alpha=alpha, confidence=confidence, batch=batch,
+        exact=exact,
+    )[statistic]
+
+
+def permutation_tests(
+    df: pl.DataFrame | GroupedScores,
+    score_col: str,
+    group_col: str,
+    statistics: tuple[str, ...] = ("dir", "dpd"),
+    threshold: float = 0.8,
+    higher_is_better: bool = True,
+    n_perm: int = 10_000,
+    seed: int | None = None,
+    sequential: bool = False,
+    alpha: float = 0.05,
+    confidence: float = 0.99,
+    batch: int = 200,
+    exact: bool | None = None,
+) -> dict[str, dict]:
+    """Permutation tests: is each observed statistic different from chance?
+
+    Shuffles group labels n_perm times and recomputes the per-group rates
+    once per shuffle; every statistic is read off those shared rates
+    (``resampling.permutation_null``), in batches of whole (n_perm, n) code
+    matrices. The null matches the former per-shuffle loop for the same seed.
+
+    With ``sequential=True``, ``n_perm`` is an upper bound. Shuffles are drawn
+    ``batch`` at a time, and a statistic stops once the exact (Clopper-Pearson)
+    ``confidence`` interval of its Monte Carlo p-value lies entirely below or
+    above ``alpha``. The decision at ``alpha`` is then settled, and further
+    shuffles would only refine a p-value that is clearly tiny or clearly
+    large (Besag & Clifford's sequential Monte Carlo test, with a CI rule).
+    Drawing ends when every statistic has stopped.
+
+    With up to ``resampling.EXACT_MAX_GROUPS`` groups (or ``exact=True``) no
+    shuffles are drawn: the statistics depend on a shuffle only through the
+    per-group success counts, whose null is multivariate hypergeometric, so
+    the null is enumerated exactly (``resampling.exact_permutation_null``).
+    The p-value then has no Monte Carlo error and ``seed`` / ``sequential``
+    are unused. ``exact=False`` forces shuffling.
+
+    Returns one dict (observed, p_value, method, n_perm, n_perm_max,
+    stopping, null_mean, null_std) per statistic name. ``method`` is "exact"
+    or "monte_carlo"; ``n_perm`` is the number of shuffles the p-value is
+    based on (0 when exact); ``stopping`` is "exact", "fixed",
+    "p_ci_below_alpha", "p_ci_above_alpha", or "max_resamples".
+    """
+    outcomes = encode_outcomes(
+        _grouped(df, score_col, group_col), threshold, higher_is_better
+    )
+    rng = np.random.default_rng(seed)
+
+    observed = resample_statistics(outcomes, None, statistics)
+    if exact is None:
+        exact = outcomes.n_groups <= EXACT_MAX_GROUPS
+    if exact:
+        support, prob = exact_permutation_null(outcomes, statistics)
+        return {
+            name: _exact_test(values, prob, float(observed[name]), n_perm)
+            for name, values in support.items()
+        }
+
+    if sequential:
+        null, stopping = _sequential_null(
+            outcomes, statistics, observed, n_perm, rng, alpha, confidence, batch
+        )
+    else:
+        null = permutation_null(outcomes, statistics, n_perm, rng)
+        stopping = dict.fromkeys(null, "fixed")
+
+    results: dict[str, dict] = {}
+    for name, null_dist in null.items():
+        obs = observed[name]
+        results[name] = {
+            "observed": float(obs),
+            "p_value": float(np.mean(_exceeds(null_dist, obs))),
+            "method": "monte_carlo",
+            "n_perm": int(null_dist.size),
+            "n_perm_max": n_perm,
+            "stopping": stopping[name],
+            "null_mean": float(np.nanmean(null_dist)),
+            "null_std": float(np.nanstd(null_dist)),
+        }
+    return results
+
+
+def _permutation_test_generic(
+    df: pl.DataFrame,
+    score_col: str,
+    group_col: str,
+    metric_fn: MetricFn,
+    n_perm: int,
+    seed: int | None,
+) -> dict:
+    """``permutation_test`` for an arbitrary ``metric_fn``: one frame per shuffle."""
     clean = df.filter(pl.col(score_col).is_not_null() & pl.col(score_col).is_not_nan())
     rng = np.random.default_rng(seed)
 
     observed = metric_fn(clean, score_col, group_col)
-
     group_values = clean[group_col].to_numpy()
     null_dist = np.empty(n_perm)
     for i in range(n_perm):
-        shuffled = rng.permutation(group_values)
-        permuted = clean.with_columns(pl.Series(group_col, shuffled))
-        null_dist[i] = metric_fn(permuted, score_col, group_col)
-
-    p_value = float(np.mean(np.abs(null_dist - np.nanmean(null_dist)) >= np.abs(observed - np.nanmean(null_dist))))
+        shuffled = clean.with_columns(pl.Series(group_col, rng.permutation(group_values)))
+        null_dist[i] = metric_fn(shuffled, score_col, group_col)
 
     return {
         "observed": float(observed),
-        "p_value": p_value,
+        "p_value": float(np.mean(_exceeds(null_dist, observed))),
+        "method": "monte_carlo",
         "n_perm": n_perm,
+        "n_perm_max": n_perm,
+        "stopping": "fixed",
         "null_mean": float(np.nanmean(null_dist)),
         "null_std": float(np.nanstd(null_dist)),
     }
 
 
+def _exact_test(values: np.ndarray, prob: np.ndarray, observed: float, n_perm: int) -> dict:
+    """``permutation_tests`` entry from an exact null (support values + probabilities).
+
+    Mirrors the Monte Carlo p-value: the null is centred on its mean over
+    defined (non-NaN) values, and NaN support points never count as extreme.
+    """
+    defined = ~np.isnan(values)
+    center = std = float("nan")
+    p_value = 0.0
+    if defined.any():
+        weights = prob[defined] / prob[defined].sum()
+        center = float(weights @ values[defined])
+        std = float(np.sqrt(weights @ (values[defined] - center) ** 2))
+        extreme = np.abs(values[defined] - center) >= np.abs(observed - center)
+        p_value = float(min(prob[defined][extreme].sum(), 1.0))
+    return {
+        "observed": observed,
+        "p_value": p_value,
+        "method": "exact",
+        "n_perm": 0,
+        "n_perm_max": n_perm,
+        "stopping": "exact",
+        "null_mean": center,
+        "null_std": std,
+    }
+
+
+def _exceeds(null_dist: np.ndarray, observed: float) -> np.ndarray:
+    """Null draws at least as far from the null mean as the observed value (two-sided)."""
+    center = np.nanmean(null_dist)
+    return np.abs(null_dist - center) >= np.abs(observed - center)
+
+
+def _sequential_null(
+    outcomes: GroupOutcomes,
+    statistics: tuple[str, ...],
+    observed: dict[str, np.ndarray],
+    n_perm: int,
+    rng: np.random.Generator,
+    alpha: float,
+    confidence: float,
+    batch: int,
+) -> tuple[dict[str, np.ndarray], dict[str, str]]:
+    """Per-statistic null distributions, each cut where its p-value CI cleared alpha."""
+    tail = (1 - confidence) / 2
+    chunks: dict[str, list[np.ndarray]] = {name: [] for name in observed}
+    null: dict[str, np.ndarray] = {}
+    stopping: dict[str, str] = {}
+
+    for values in permutation_batches(outcomes, statistics, n_perm, rng, batch):
+        for name, value in values.items():
+            if name in null:
+                continue
+            chunks[name].append(value)
+            drawn = np.concatenate(chunks[name])
+            n, k = drawn.size, int(_exceeds(drawn, observed[name]).sum())
+            low = sp_stats.beta.ppf(tail, k, n - k + 1) if k > 0 else 0.0
+            high = sp_stats.beta.ppf(1 - tail, k + 1, n - k) if k < n else 1.0
+            if high < alpha or low > alpha:
+                null[name] = drawn
+                stopping[name] = "p_ci_below_alpha" if high < alpha else "p_ci_above_alpha"
+        if len(null) == len(chunks):
+            break
+
+    for name, parts in chunks.items():
+        if name not in null:
+            null[name] = np.concatenate(parts)
+            stopping[name] = "max_resamples"
+    return {name: null[name] for name in chunks}, stopping
+
+
 # ---------------------------------------------------------------------------
 # Comparison helpers
 # ---------------------------------------------------------------------------
@@ -0,0 +1,606 @@
+"""NumPy resampling engine for the binarized fairness metrics.
+
+A (score, grouping) cell is first reduced to arrays once: ``group_scores``
+drops NaN/null scores and encodes groups as integer codes (``GroupedScores``).
+analyze.py builds these from a per-ruler cache instead of re-filtering frames.
+
+DIR and DPD depend on the data only through each case's group and whether it
+reached the beneficial outcome. ``encode_outcomes`` reduces a cell to those
+two vectors: integer group codes and a boolean success vector. A whole
+matrix of resamples, one row per resample holding case indices, is then
+scored at once. Per-group counts come from a single ``np.bincount`` over row
+offset codes (``row * n_groups + code``), so no DataFrame is built per
+resample. The same counts give the BCa jackknife in closed form: leaving
+one case out only decrements its own group's size and hits.
+
+No I/O.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+import polars as pl
+from scipy.special import ndtr, ndtri
+
+# Statistics computable from one per-group rate vector. "group_rates" expands
+# to one ``rate_<group>`` entry per group.
+STATISTICS = ("dir", "dpd", "best_rate", "worst_rate", "group_rates")
+# Bootstrap resampling units: i.i.d. cases, cases within each group, or whole
+# clusters (patients) with all of their cases.
+RESAMPLING_SCHEMES = ("case", "stratified", "cluster")
+
+
+@dataclass(frozen=True, slots=True)
+class GroupedScores:
+    """Valid scores of one (score, grouping) cell with integer group codes.
+
+    ``codes[i]`` indexes ``groups`` (sorted names; a null group sorts last)
+    for the case with score ``scores[i]``. Cases with a null or NaN score are
+    already dropped, so every listed group has at least one case. Rows keep
+    their frame order. ``clusters[i]``, if set, is an integer cluster code
+    (e.g. the patient of a multi-exam case) for the cluster bootstrap.
+    ``all_groups``, if set, also lists the groups whose scores are all
+    NaN/null (same order), so summaries can still report them with n=0.
+    """
+
+    scores: np.ndarray
+    codes: np.ndarray
+    groups: list
+    clusters: np.ndarray | None = None
+    all_groups: list | None = None
+
+    @property
+    def n(self) -> int:
+        return int(self.codes.size)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.groups)
+
+
+def group_scores(
+    df: pl.DataFrame, score_col: str, group_col: str, cluster_col: str | None = None
+) -> GroupedScores:
+    """Drop NaN/null scores from a frame and encode its groups (see ``GroupedScores``).
+
+    ``cluster_col`` (e.g. ``patient_id``) is encoded as integer cluster codes.
+    """
+    clean = df.filter(pl.col(score_col).is_not_null() & pl.col(score_col).is_not_nan())
+    if clean.height == 0:
+        msg = f"No valid scores in {score_col} for any group"
+        raise ValueError(msg)
+
+    def _sorted(values: list) -> list:
+        return sorted(set(values), key=lambda v: (v is None, v))
+
+    values = clean[group_col].to_list()
+    groups = _sorted(values)
+    index = {g: i for i, g in enumerate(groups)}
+    codes = np.fromiter((index[v] for v in values), dtype=np.intp, count=len(values))
+    return GroupedScores(
+        scores=clean[score_col].to_numpy().astype(float),
+        codes=codes,
+        groups=groups,
+        clusters=None if cluster_col is None else cluster_codes(clean[cluster_col]),
+        all_groups=_sorted(df[group_col].to_list()),
+    )
+
+
+def cluster_codes(ids: pl.Series) -> np.ndarray:
+    """Integer codes of cluster ids (e.g. patient ids); raises ValueError on nulls."""
+    if ids.null_count():
+        msg = f"Null cluster ids in {ids.name}"
+        raise ValueError(msg)
+    _, codes = np.unique(ids.cast(pl.String).to_numpy(), return_inverse=True)
+    return codes
+
+
+@dataclass(frozen=True, slots=True)
+class GroupOutcomes:
+    """Cases of one (score, grouping) cell encoded for resampling.
+
+    ``codes[i]`` indexes ``groups`` (as in ``GroupedScores``) and
+    ``success[i]`` is the binarized beneficial outcome of case ``i``.
+    ``clusters`` are the optional cluster codes of ``GroupedScores``.
+    """
+
+    codes: np.ndarray
+    success: np.ndarray
+    groups: list
+    clusters: np.ndarray | None = None
+
+    @property
+    def n(self) -> int:
+        return int(self.codes.size)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.groups)
+
+
+def encode_outcomes(
+    grouped: GroupedScores, threshold: float, higher_is_better: bool
+) -> GroupOutcomes:
+    """Binarize a cell's scores exactly as ``metrics._group_rates`` does."""
+    scores = grouped.scores
+    success = scores > threshold if higher_is_better else scores < threshold
+    return GroupOutcomes(
+        codes=grouped.codes,
+        success=success,
+        groups=grouped.groups,
+        clusters=grouped.clusters,
+    )
+
+
+def group_rates(outcomes: GroupOutcomes, indices: np.ndarray | None = None) -> np.ndarray:
+    """Per-group success rates for every resample in ``indices``.
+
+    ``indices`` has shape ``(..., m)``: each trailing row lists the cases of
+    one resample (with repeats). Returns shape ``(..., n_groups)``, NaN where
+    a group has no case in that resample. ``None`` scores the data as is.
+    """
+    if indices is None:
+        indices = np.arange(outcomes.n)
+    indices = np.asarray(indices, dtype=np.intp)
+    return _bincount_rates(
+        outcomes.codes[indices], outcomes.success[indices], outcomes.n_groups
+    )
+
+
+def permuted_group_rates(outcomes: GroupOutcomes, permutations: np.ndarray) -> np.ndarray:
+    """Per-group success rates with group labels shuffled by each permutation row.
+
+    ``permutations`` has shape ``(n_perm, n)``. Row ``k`` reassigns the group
+    of case ``i`` to ``codes[permutations[k, i]]`` while outcomes stay fixed,
+    like shuffling the group column of the frame.
+    """
+    codes = outcomes.codes[permutations]
+    return _bincount_rates(
+        codes, np.broadcast_to(outcomes.success, codes.shape), outcomes.n_groups
+    )
+
+
+def _bincount_rates(codes: np.ndarray, success: np.ndarray, n_groups: int) -> np.ndarray:
+    """Rates per (row, group) from one bincount over row-offset group codes."""
+    lead = codes.shape[:-1]
+    codes = codes.reshape(-1, codes.shape[-1])
+    n_rows = codes.shape[0]
+
+    flat = (np.arange(n_rows)[:, None] * n_groups + codes).ravel()
+    size = n_rows * n_groups
+    totals = np.bincount(flat, minlength=size)
+    hits = np.bincount(flat, weights=success.reshape(-1), minlength=size)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = hits / totals
+    return rates.reshape(*lead, n_groups)
+
+
+def rate_statistics(
+    rates: np.ndarray, statistics: tuple[str, ...], groups: list
+) -> dict[str, np.ndarray]:
+    """Several statistics along the last (group) axis of one shared rate array.
+
+    Groups absent from a resample (NaN rate) are ignored. DIR and DPD match
+    ``disparate_impact_ratio`` / ``demographic_parity_difference`` (DIR is
+    NaN when the best group's rate is 0); ``best_rate`` / ``worst_rate`` are
+    the max / min group rate; ``group_rates`` adds ``rate_<group>`` for each
+    of ``groups``.
+    """
+    # Pairwise fmax/fmin over the few group columns: NaN-skipping like
+    # nanmax/nanmin, without their slow strided reduction over a short axis
+    columns = np.moveaxis(rates, -1, 0)
+    best = functools.reduce(np.fmax, columns)
+    worst = functools.reduce(np.fmin, columns)
+    out: dict[str, np.ndarray] = {}
+    for statistic in statistics:
+        if statistic == "dir":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out["dir"] = np.where(best == 0.0, np.nan, worst / best)
+        elif statistic == "dpd":
+            out["dpd"] = best - worst
+        elif statistic == "best_rate":
+            out["best_rate"] = best
+        elif statistic == "worst_rate":
+            out["worst_rate"] = worst
+        elif statistic == "group_rates":
+            for j, group in enumerate(groups):
+                out[f"rate_{group}"] = rates[..., j]
+        else:
+            msg = f"Unknown statistic: {statistic!r}. Valid: {STATISTICS}"
+            raise ValueError(msg)
+    return out
+
+
+def resample_statistics(
+    outcomes: GroupOutcomes, indices: np.ndarray | None, statistics: tuple[str, ...]
+) -> dict[str, np.ndarray]:
+    """``rate_statistics`` of every resample in ``indices``, from one rate pass."""
+    return rate_statistics(group_rates(outcomes, indices), statistics, outcomes.groups)
+
+
+def permutation_batches(
+    outcomes: GroupOutcomes,
+    statistics: tuple[str, ...],
+    n_perm: int,
+    rng: np.random.Generator,
+    batch: int = 1_000,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Null values of several statistics, ``batch`` shuffles at a time.
+
+    Permutations are drawn with ``rng.permuted`` on a tiled ``arange``, which
+    consumes the generator exactly like one ``rng.permutation`` call per
+    resample, so the concatenated batches do not depend on ``batch`` and a
+    consumer may stop early (sequential tests). Every statistic is read off
+    the same permuted rates.
+    """
+    for start in range(0, n_perm, batch):
+        rows = min(batch, n_perm - start)
+        perms = rng.permuted(np.tile(np.arange(outcomes.n), (rows, 1)), axis=1)
+        yield rate_statistics(
+            permuted_group_rates(outcomes, perms), statistics, outcomes.groups
+        )
+
+
+def permutation_null(
+    outcomes: GroupOutcomes,
+    statistics: tuple[str, ...],
+    n_perm: int,
+    rng: np.random.Generator,
+    batch: int = 1_000,
+) -> dict[str, np.ndarray]:
+    """Null distributions of several statistics under shuffled group labels.
+
+    A seed gives the same null as the former per-iteration loop while memory
+    stays at ``batch x n`` (see ``permutation_batches``).
+    """
+    null: dict[str, np.ndarray] = {}
+    start = 0
+    for values in permutation_batches(outcomes, statistics, n_perm, rng, batch):
+        rows = 0
+        for name, value in values.items():
+            null.setdefault(name, np.empty(n_perm))[start:start + value.size] = value
+            rows = value.size
+        start += rows
+    return null
+
+
+# ---------------------------------------------------------------------------
+# Bootstrap confidence intervals
+# ---------------------------------------------------------------------------
+
+
+def bootstrap_batches(
+    outcomes: GroupOutcomes,
+    statistics: tuple[str, ...],
+    n_boot: int,
+    rng: np.random.Generator,
+    batch: int = 1_000,
+    scheme: str = "case",
+) -> Iterator[dict[str, np.ndarray]]:
+    """Statistics of ``n_boot`` bootstrap resamples, ``batch`` resamples at a time.
+
+    ``scheme`` (see ``RESAMPLING_SCHEMES``) picks the resampling unit:
+
+    - ``case``: one ``rng.integers(0, n, (rows, n))`` index matrix per batch,
+      the same stream ``scipy.stats.bootstrap`` draws.
+    - ``stratified``: each group's cases are resampled within the group
+      (``stratum_blocks``), so every group keeps its size and never drops out
+      of a resample.
+    - ``cluster``: whole clusters are drawn with replacement and every case
+      of a drawn cluster comes along (``cluster_blocks``), so cases of one
+      patient are never treated as independent.
+
+    The concatenated batches do not depend on ``batch``, so a consumer may
+    stop early.
+    """
+    if scheme == "stratified":
+        order, offsets, sizes = stratum_blocks(outcomes)
+    elif scheme == "cluster":
+        unit_sizes, unit_hits = cluster_blocks(outcomes)
+    elif scheme != "case":
+        msg = f"Unknown resampling scheme: {scheme!r}. Valid: {RESAMPLING_SCHEMES}"
+        raise ValueError(msg)
+
+    for start in range(0, n_boot, batch):
+        rows = min(batch, n_boot - start)
+        if scheme == "cluster":
+            rates = cluster_rates(
+                unit_sizes, unit_hits, _cluster_counts(unit_sizes.shape[0], rows, rng)
+            )
+            yield rate_statistics(rates, statistics, outcomes.groups)
+            continue
+        if scheme == "stratified":
+            indices = order[offsets + rng.integers(0, sizes, size=(rows, outcomes.n))]
+        else:
+            indices = rng.integers(0, outcomes.n, size=(rows, outcomes.n))
+        yield resample_statistics(outcomes, indices, statistics)
+
+
+def stratum_blocks(outcomes: GroupOutcomes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Index blocks for the stratified bootstrap, one per group.
+
+    Returns ``(order, offsets, sizes)`` over the ``n`` slots of a resample:
+    ``order`` lists case indices grouped by group, and slot ``j`` draws from
+    ``order[offsets[j] : offsets[j] + sizes[j]]``, its group's block. A whole
+    resample matrix is then ``order[offsets + rng.integers(0, sizes, ...)]``.
+    """
+    order = np.argsort(outcomes.codes, kind="stable")
+    group_sizes = np.bincount(outcomes.codes, minlength=outcomes.n_groups)
+    starts = np.cumsum(group_sizes) - group_sizes
+    slot_codes = outcomes.codes[order]
+    return order, starts[slot_codes], group_sizes[slot_codes]
+
+
+def cluster_blocks(outcomes: GroupOutcomes) -> tuple[np.ndarray, np.ndarray]:
+    """Per-cluster group counts for the cluster bootstrap.
+
+    Returns ``(sizes, hits)``, each ``(n_clusters, n_groups)``: how many
+    cases and successes each cluster contributes to each group. A resample
+    that draws cluster ``c`` ``k`` times adds ``k`` times row ``c``.
+
+    Raises ValueError if ``outcomes`` has no cluster codes.
+    """
+    if outcomes.clusters is None:
+        msg = "Cluster bootstrap needs cluster codes (e.g. group_scores(..., cluster_col=...))"
+        raise ValueError(msg)
+    # Re-encode densely: a cell may hold only some of its ruler's clusters
+    _, clusters = np.unique(outcomes.clusters, return_inverse=True)
+    n_clusters = int(clusters.max()) + 1
+    flat = clusters * outcomes.n_groups + outcomes.codes
+    size = n_clusters * outcomes.n_groups
+    sizes = np.bincount(flat, minlength=size).reshape(n_clusters, outcomes.n_groups)
+    hits = np.bincount(flat, weights=outcomes.success, minlength=size)
+    return sizes.astype(float), hits.reshape(n_clusters, outcomes.n_groups)
+
+
+def cluster_rates(sizes: np.ndarray, hits: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Per-group rates of resamples given as cluster multiplicities.
+
+    ``counts`` has shape ``(..., n_clusters)``; the group totals of every
+    resample are two matrix products with the ``cluster_blocks`` counts.
+    NaN where a group has no case in a resample.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (counts @ hits) / (counts @ sizes)
+
+
+def _cluster_counts(n_clusters: int, rows: int, rng: np.random.Generator) -> np.ndarray:
+    """Multiplicity of every cluster in ``rows`` resamples of ``n_clusters`` draws."""
+    picks = rng.integers(0, n_clusters, size=(rows, n_clusters))
+    flat = (np.arange(rows)[:, None] * n_clusters + picks).ravel()
+    counts = np.bincount(flat, minlength=rows * n_clusters)
+    return counts.reshape(rows, n_clusters).astype(float)
+
+
+def jackknife_statistics(
+    outcomes: GroupOutcomes, statistics: tuple[str, ...], scheme: str = "case"
+) -> dict[str, np.ndarray]:
+    """Leave-one-out statistics, from closed-form per-group count updates.
+
+    Dropping case ``i`` only changes its own group's counts, by one case and
+    ``success[i]`` hits, so all ``n`` leave-one-out rate vectors are the full
+    counts minus one row of per-case counts. With ``scheme="cluster"`` whole
+    clusters are left out instead (rows of ``cluster_blocks``). A group
+    emptied this way gets a NaN rate and is ignored, as in ``group_rates``.
+    """
+    if scheme == "cluster":
+        unit_sizes, unit_hits = cluster_blocks(outcomes)
+    else:
+        unit_sizes = np.zeros((outcomes.n, outcomes.n_groups))
+        unit_sizes[np.arange(outcomes.n), outcomes.codes] = 1.0
+        unit_hits = unit_sizes * outcomes.success[:, None]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = (unit_hits.sum(axis=0) - unit_hits) / (unit_sizes.sum(axis=0) - unit_sizes)
+    return rate_statistics(rates, statistics, outcomes.groups)
+
+
+def bca_interval(
+    distribution: np.ndarray, estimate: float, jackknife: np.ndarray, alpha: float
+) -> tuple[float, float]:
+    """Bias-corrected and accelerated (BCa) interval at level ``1 - alpha``.
+
+    Follows ``scipy.stats.bootstrap`` (Efron & Tibshirani 14.3, 15.4): the
+    bias correction is the mid-rank of ``estimate`` in the bootstrap
+    ``distribution``, and the acceleration comes from the ``jackknife``
+    values. Returns NaN endpoints when either is undefined (e.g. a
+    degenerate distribution); callers fall back to ``percentile_interval``
+    on the same distribution.
+    """
+    b = distribution.size
+    below = np.count_nonzero(distribution < estimate)
+    at_or_below = np.count_nonzero(distribution <= estimate)
+    z0 = ndtri((below + at_or_below) / (2 * b))
+
+    n = float(jackknife.size)
+    u = (n - 1) * (jackknife.mean() - jackknife)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a_hat = 1 / 6 * (np.sum(u**3) / n**3) / (np.sum(u**2) / n**2) ** (3 / 2)
+
+        z_alpha = float(ndtri(alpha / 2))
+        levels = []
+        for z in (z_alpha, -z_alpha):
+            levels.append(ndtr(z0 + (z0 + z) / (1 - a_hat * (z0 + z))))
+    return _quantiles(distribution, levels)
+
+
+def percentile_interval(distribution: np.ndarray, alpha: float) -> tuple[float, float]:
+    """Percentile interval at level ``1 - alpha`` (NaN if the distribution has NaN)."""
+    return _quantiles(distribution, [alpha / 2, 1 - alpha / 2])
+
+
+def _quantiles(distribution: np.ndarray, levels: list[float]) -> tuple[float, float]:
+    """Linear-interpolation quantiles; NaN for a NaN level or any NaN value."""
+    if np.isnan(distribution).any():
+        return float("nan"), float("nan")
+    low, high = (
+        float(np.quantile(distribution, q)) if not np.isnan(q) else float("nan")
+        for q in levels
+    )
+    return low, high
+
+
+# ---------------------------------------------------------------------------
+# Exact permutation null
+# ---------------------------------------------------------------------------
+
+
+# Largest group count for which permutation tests use the exact null. The
+# support has at most (n + 1) ** (groups - 1) points, ~26k for 228 cases in
+# three groups.
+EXACT_MAX_GROUPS = 3
+
+
+@functools.lru_cache(maxsize=8)
+def _log_factorials(n: int) -> np.ndarray:
+    """log(k!) for k = 0..n."""
+    table = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n + 1)))))
+    table.flags.writeable = False
+    return table
+
+
+def hypergeometric_support(sizes: np.ndarray, total: int) -> tuple[np.ndarray, np.ndarray]:
+    """Every split of ``total`` successes over groups of ``sizes``, with its probability.
+
+    Shuffling group labels while outcomes stay fixed makes the per-group
+    success counts multivariate hypergeometric. Returns ``(counts, prob)``:
+    counts of shape ``(S, n_groups)`` (rows sum to ``total``) and their
+    probabilities, from cached log-factorials.
+    """
+    sizes = np.asarray(sizes, dtype=np.intp)
+    n = int(sizes.sum())
+    # All counts of the first G - 1 groups; the last group takes the rest
+    grids = np.meshgrid(*(np.arange(m + 1) for m in sizes[:-1]), indexing="ij")
+    head = np.stack([g.ravel() for g in grids], axis=-1)
+    last = total - head.sum(axis=1)
+    keep = (last >= 0) & (last <= sizes[-1])
+    counts = np.column_stack((head[keep], last[keep]))
+
+    lf = _log_factorials(n)
+    log_prob = (lf[sizes] - lf[counts] - lf[sizes - counts]).sum(axis=1)
+    log_prob -= lf[n] - lf[total] - lf[n - total]
+    return counts, np.exp(log_prob)
+
+
+def exact_permutation_null(
+    outcomes: GroupOutcomes, statistics: tuple[str, ...]
+) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """Exact permutation null of rate statistics: support values and probabilities.
+
+    The statistics depend on a shuffle only through the per-group success
+    counts, so enumerating ``hypergeometric_support`` replaces Monte Carlo
+    shuffles with the exact distribution. Practical for up to
+    ``EXACT_MAX_GROUPS`` groups.
+    """
+    sizes = np.bincount(outcomes.codes, minlength=outcomes.n_groups)
+    counts, prob = hypergeometric_support(sizes, int(outcomes.success.sum()))
+    rates = counts / sizes
+    return rate_statistics(rates, statistics, outcomes.groups), prob
+
+
+# ---------------------------------------------------------------------------
+# Threshold sweeps
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class SortedScores:
+    """A cell's scores sorted by (group, score), with group blocks at ``offsets``.
+
+    Group ``g`` holds ``scores[offsets[g]:offsets[g + 1]]`` in ascending order,
+    so the number of its cases above or below any cutoff is one
+    ``np.searchsorted``. ``groups`` are sorted names (a null group sorts last).
+    """
+
+    scores: np.ndarray
+    offsets: np.ndarray
+    groups: list
+
+    @property
+    def n(self) -> int:
+        return int(self.scores.size)
+
+
+def sort_scores(grouped: GroupedScores) -> SortedScores:
+    """Sort a cell's scores once per group (see ``SortedScores``)."""
+    order = np.lexsort((grouped.scores, grouped.codes))
+    offsets = np.concatenate(
+        ([0], np.cumsum(np.bincount(grouped.codes, minlength=grouped.n_groups)))
+    )
+    return SortedScores(
+        scores=grouped.scores[order], offsets=offsets, groups=grouped.groups
+    )
+
+
+def sweep_rates(
+    sorted_scores: SortedScores,
+    thresholds: np.ndarray,
+    higher_is_better: bool,
+    weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """Per-group success rates at every threshold, from the sorted blocks.
+
+    Success is ``score > t`` when higher_is_better and ``score < t``
+    otherwise, as in ``metrics._group_rates``. ``weights`` (shape
+    ``(..., n)``, aligned with ``sorted_scores.scores``) gives each case a
+    multiplicity, e.g. bootstrap counts; a group with zero total weight gets
+    a NaN rate. Returns shape ``(..., n_thresholds, n_groups)``.
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    offsets = sorted_scores.offsets
+    n_groups = len(sorted_scores.groups)
+    side = "right" if higher_is_better else "left"
+
+    # positions[t, g]: cases of group g at or below (or strictly below) cutoff t
+    positions = np.empty((thresholds.size, n_groups), dtype=np.intp)
+    for g in range(n_groups):
+        block = sorted_scores.scores[offsets[g]:offsets[g + 1]]
+        positions[:, g] = offsets[g] + np.searchsorted(block, thresholds, side=side)
+
+    if weights is None:
+        weights = np.ones(sorted_scores.n)
+    weights = np.asarray(weights, dtype=float)
+    prefix = np.concatenate(
+        (np.zeros((*weights.shape[:-1], 1)), np.cumsum(weights, axis=-1)), axis=-1
+    )
+
+    start = prefix[..., offsets[:-1]][..., None, :]
+    total = prefix[..., offsets[1:]][..., None, :] - start
+    below = prefix[..., positions] - start
+    success = total - below if higher_is_better else below
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, success / total, np.nan)
+
+
+def bootstrap_sweep_rates(
+    sorted_scores: SortedScores,
+    thresholds: np.ndarray,
+    higher_is_better: bool,
+    n_boot: int,
+    rng: np.random.Generator,
+    batch: int = 1_000,
+) -> np.ndarray:
+    """Per-group rates at every threshold for ``n_boot`` case resamples.
+
+    Each resample is an ``(n,)`` vector of draw counts (one offset bincount
+    over a ``(batch, n)`` index matrix) applied as weights to the same sorted
+    blocks, so a whole curve costs one cumulative sum per resample. Returns
+    shape ``(n_boot, n_thresholds, n_groups)``.
+    """
+    n = sorted_scores.n
+    out = np.empty((n_boot, np.size(thresholds), len(sorted_scores.groups)))
+    for start in range(0, n_boot, batch):
+        rows = min(batch, n_boot - start)
+        indices = rng.integers(0, n, size=(rows, n))
+        flat = (np.arange(rows)[:, None] * n + indices).ravel()
+        weights = np.bincount(flat, minlength=rows * n).reshape(rows, n)
+        out[start:start + rows] = sweep_rates(
+            sorted_scores, thresholds, higher_is_better, weights
+        )
+    return out
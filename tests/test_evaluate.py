@@ -0,0 +1,61 @@
+"""evaluate_folder / evaluate_matrix output layout, including runs with no evaluable cases."""
+
+import nibabel as nib
+import numpy as np
+import polars as pl
+import pytest
+
+from src.fairness.evaluate import evaluate_folder, evaluate_matrix
+
+METRICS = {"dice", "hd95", "ndsc", "instances"}
+
+
+def _write_case(folder, case_id, data):
+    folder.mkdir(exist_ok=True)
+    nib.save(nib.Nifti1Image(data, np.diag([0.6, 0.6, 3.3, 1.0])), folder / f"{case_id}.nii.gz")
+
+
+@pytest.fixture
+def folders(tmp_path):
+    rng = np.random.default_rng(0)
+    mapping = []
+    for i in range(2):
+        case_id = f"case_{i}"
+        ref = np.zeros((16, 16, 6), dtype=np.uint8)
+        ref[3:9, 3:12, 1:5] = 1
+        ref[10:14, 4:10, 2:4] = 2
+        pred = np.where(rng.random(ref.shape) < 0.05, 0, ref).astype(np.uint8)
+        _write_case(tmp_path / "refs", case_id, ref)
+        _write_case(tmp_path / "preds", case_id, pred)
+        mapping.append({"case_id": case_id, "series_submitter_id": f"s{i}", "split": "test"})
+    return tmp_path, mapping
+
+
+def test_no_cases_gives_empty_table_with_full_schema(folders):
+    root, mapping = folders
+    full = evaluate_folder(root / "preds", root / "refs", mapping, metrics=METRICS)
+
+    output = root / "out" / "eval.csv"
+    empty = evaluate_folder(
+        root / "preds", root / "refs", mapping, output_path=output, metrics=METRICS,
+        split="val",
+    )
+
+    assert empty.height == 0
+    assert empty.schema == full.schema
+    assert pl.read_csv(output).columns == full.columns
+    assert not output.with_name("eval.csv.parts").exists()
+
+
+def test_matrix_with_no_cases_gives_empty_table_with_full_schema(folders):
+    root, mapping = folders
+    sources = {"gold": root / "refs", "model": root / "preds"}
+    full = evaluate_matrix(sources, mapping, metrics=METRICS)
+
+    output = root / "out" / "matrix.parquet"
+    empty = evaluate_matrix(sources, mapping, output_path=output, metrics=METRICS, split="val")
+
+    assert full.height > 0
+    assert empty.height == 0
+    assert empty.schema == full.schema
+    assert pl.read_parquet(output).schema == full.schema
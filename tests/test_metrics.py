@@ -0,0 +1,122 @@
+"""Native statistics in metrics.py against Polars, SciPy and statsmodels references."""
+
+import numpy as np
+import polars as pl
+import pytest
+
+from src.fairness.analyze import _ols_by_score
+from src.fairness.metrics import group_summary, ols_regression, ols_regressions
+
+COVARIATES = ["sex", "race", "age"]
+
+
+@pytest.fixture
+def scores():
+    rng = np.random.default_rng(0)
+    n = 80
+    sex = rng.choice(["F", "M"], n)
+    race = rng.choice(["Black", "White"], n)
+    age = rng.uniform(20, 80, n)
+    dice = 0.85 + 0.02 * (sex == "M") - 0.01 * (race == "White") + rng.normal(0, 0.03, n)
+    dice[[3, 17]] = np.nan
+    hd95 = 2.0 + 0.01 * age + rng.gamma(2.0, 0.5, n)
+    hd95[[5, 40, 41]] = np.inf  # missed label
+    return pl.DataFrame({
+        "sex": sex,
+        "race": race,
+        "age": age,
+        "dice_macro": dice,
+        "hd95_macro": hd95,
+        "hd95_disc": hd95.copy(),
+        "ndsc_macro": np.full(n, np.nan),
+    })
+
+
+def _statsmodels_fit(df: pl.DataFrame, score_col: str):
+    sm = pytest.importorskip("statsmodels.api")
+    clean = df.filter(pl.col(score_col).is_finite())
+    X = np.column_stack([
+        np.ones(clean.height),
+        (clean["sex"] == "M").cast(pl.Float64).to_numpy(),
+        (clean["race"] == "White").cast(pl.Float64).to_numpy(),
+        clean["age"].to_numpy(),
+    ])
+    return sm.OLS(clean[score_col].to_numpy(), X).fit()
+
+
+@pytest.mark.parametrize("score_col", ["dice_macro", "hd95_macro"])
+def test_ols_matches_statsmodels(scores, score_col):
+    ours = ols_regressions(scores, ["dice_macro", "hd95_macro", "hd95_disc"], COVARIATES)
+    ref = _statsmodels_fit(scores, score_col)
+    result = ours[score_col]
+
+    assert result["n"] == ref.nobs
+    np.testing.assert_allclose(result["r_squared"], ref.rsquared, rtol=1e-10)
+    np.testing.assert_allclose(result["adj_r_squared"], ref.rsquared_adj, rtol=1e-10)
+    np.testing.assert_allclose(result["f_stat"], ref.fvalue, rtol=1e-10)
+    np.testing.assert_allclose(result["f_pvalue"], ref.f_pvalue, rtol=1e-8)
+
+    names = ["const", "sex_M", "race_White", "age"]
+    assert list(result["coefficients"]) == names
+    ci = ref.conf_int()
+    for i, name in enumerate(names):
+        coef = result["coefficients"][name]
+        np.testing.assert_allclose(coef["coef"], ref.params[i], rtol=1e-10)
+        np.testing.assert_allclose(coef["se"], ref.bse[i], rtol=1e-10)
+        np.testing.assert_allclose(coef["p"], ref.pvalues[i], rtol=1e-8)
+        np.testing.assert_allclose([coef["ci_low"], coef["ci_high"]], ci[i], rtol=1e-10)
+
+
+def test_inf_response_does_not_poison_shared_fit(scores):
+    batched = ols_regressions(scores, ["dice_macro", "hd95_macro"], COVARIATES)
+    alone = ols_regression(scores, "dice_macro", COVARIATES)
+    assert np.isfinite(batched["hd95_macro"]["r_squared"])
+    assert batched["dice_macro"] == alone
+
+
+def test_all_nan_response_drops_only_itself(scores):
+    score_cols = ["dice_macro", "hd95_macro", "ndsc_macro"]
+    with pytest.raises(ValueError, match="No complete rows"):
+        ols_regressions(scores, score_cols, COVARIATES)
+
+    results = _ols_by_score(scores, score_cols, COVARIATES, "gold")
+    assert list(results) == ["dice_macro", "hd95_macro"]
+    assert results["dice_macro"] == ols_regression(scores, "dice_macro", COVARIATES)
+
+
+def test_group_summary_matches_polars():
+    rng = np.random.default_rng(1)
+    df = pl.DataFrame({
+        "group": rng.choice(["a", "b", "c"], 60).tolist() + [None] * 3,
+        "score": rng.normal(0.8, 0.1, 63),
+    })
+    expected = (
+        df.group_by("group")
+        .agg(
+            pl.col("score").count().alias("n"),
+            pl.col("score").mean().alias("mean"),
+            pl.col("score").median().alias("median"),
+            pl.col("score").std().alias("std"),
+            pl.col("score").quantile(0.25).alias("q25"),
+            pl.col("score").quantile(0.75).alias("q75"),
+        )
+        .with_columns((pl.col("q75") - pl.col("q25")).alias("iqr"))
+        .sort("group", nulls_last=True)
+    )
+    summary = group_summary(df, "score", "group")
+    assert summary.columns == expected.columns
+    assert summary["group"].to_list() == expected["group"].to_list()
+    assert summary["n"].to_list() == expected["n"].to_list()
+    for col in ["mean", "median", "std", "q25", "q75", "iqr"]:
+        np.testing.assert_allclose(summary[col].to_numpy(), expected[col].to_numpy(), rtol=1e-12)
+
+
+def test_group_summary_keeps_all_nan_groups_and_float_std():
+    df = pl.DataFrame({"group": ["a", "b", "c"], "score": [0.7, np.nan, 0.9]})
+    summary = group_summary(df, "score", "group")
+
+    assert summary["group"].to_list() == ["a", "b", "c"]
+    assert summary["n"].to_list() == [1, 0, 1]
+    assert np.isnan(summary["mean"][1])
+    assert summary.schema["std"] == pl.Float64
+    assert summary["std"].null_count() == 3
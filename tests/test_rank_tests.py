@@ -0,0 +1,115 @@
+"""Native rank tests and Dunn's post-hoc against SciPy and frozen scikit-posthocs values."""
+
+import numpy as np
+import pytest
+from scipy import stats
+from statsmodels.stats.multitest import multipletests
+
+from src.eda.stats import _adjust_pvalues, kruskal_result, mann_whitney_result
+from src.fairness.metrics import rank_tests
+
+# Dunn's test on GROUPS from scikit_posthocs.posthoc_dunn 0.17.1 (the package
+# is no longer a dependency), keyed by pair.
+GROUPS = {
+    "A": [0.81, 0.85, 0.85, 0.90, 0.78, 0.88, 0.91, 0.85],
+    "B": [0.70, 0.72, 0.85, 0.69, 0.75, 0.71, 0.74],
+    "C": [0.92, 0.95, 0.90, 0.93, 0.97, 0.85, 0.94, 0.96, 0.90],
+    "D": [0.80, 0.79, 0.83, 0.72, 0.85, 0.77],
+}
+POSTHOC_DUNN = {
+    "bonferroni": {
+        "A vs B": 0.07412198117037852,
+        "A vs C": 0.3631779116503352,
+        "A vs D": 0.9935879750320404,
+        "B vs C": 7.150045474034417e-05,
+        "B vs D": 1.0,
+        "C vs D": 0.009757469523424843,
+    },
+    "holm": {
+        "A vs B": 0.049414654113585685,
+        "A vs C": 0.1815889558251676,
+        "A vs D": 0.3311959916773468,
+        "B vs C": 7.150045474034417e-05,
+        "B vs D": 0.3311959916773468,
+        "C vs D": 0.008131224602854037,
+    },
+}
+
+
+def _tied_scores(n: int, n_cols: int, seed: int = 0) -> np.ndarray:
+    """Scores rounded to two decimals (many ties) with some NaN per column."""
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.normal(0.85, 0.05, (n, n_cols)), 2)
+    values[rng.random((n, n_cols)) < 0.1] = np.nan
+    return values
+
+
+@pytest.mark.parametrize("n", [12, 90])
+def test_rank_tests_match_scipy_mannwhitneyu(n):
+    rng = np.random.default_rng(n)
+    values = _tied_scores(n, 3, seed=n)
+    values[:, 2] = rng.permutation(n) + 0.5  # tie- and NaN-free column
+    codes = rng.integers(0, 2, n)
+    codes[0] = -1  # dropped row
+
+    for j, result in enumerate(rank_tests(values, codes, ["F", "M"])):
+        keep = (codes >= 0) & ~np.isnan(values[:, j])
+        a = values[keep & (codes == 0), j]
+        b = values[keep & (codes == 1), j]
+        ref = stats.mannwhitneyu(a, b, alternative="two-sided")
+        assert result["test"] == "mann_whitney"
+        assert (result["group_a"], result["group_b"]) == ("F", "M")
+        assert (result["n_a"], result["n_b"]) == (a.size, b.size)
+        np.testing.assert_allclose(result["U"], ref.statistic, rtol=1e-12)
+        np.testing.assert_allclose(result["p"], ref.pvalue, rtol=1e-10)
+        assert result == mann_whitney_result(a, b) | {"group_a": "F", "group_b": "M"}
+
+
+def test_rank_tests_match_scipy_kruskal():
+    values = _tied_scores(120, 4)
+    values[:, 3] -= 0.05 * (np.arange(120) % 3)  # real group effect
+    codes = np.arange(120) % 3
+    groups = ["a", "b", "c"]
+
+    results = rank_tests(values, codes, groups)
+    for j, result in enumerate(results):
+        samples = [values[(codes == g) & ~np.isnan(values[:, j]), j] for g in range(3)]
+        ref = stats.kruskal(*samples)
+        assert result["test"] == "kruskal_wallis"
+        np.testing.assert_allclose(result["H"], ref.statistic, rtol=1e-12)
+        np.testing.assert_allclose(result["p"], ref.pvalue, rtol=1e-10)
+        assert result["ns"] == {g: s.size for g, s in zip(groups, samples)}
+    assert results[3]["posthoc"]
+
+
+def test_all_identical_scores_are_no_difference():
+    values = np.full((10, 1), 0.9)
+    (result,) = rank_tests(values, np.arange(10) % 3, ["a", "b", "c"])
+    assert np.isnan(result["H"])
+    assert result["p"] == 1.0
+    assert result["posthoc"] == []
+
+
+@pytest.mark.parametrize("p_adjust", ["bonferroni", "holm"])
+def test_dunn_matches_frozen_posthoc_dunn(p_adjust):
+    result = kruskal_result(GROUPS, p_adjust=p_adjust)
+    assert result["p"] < 0.05
+
+    posthoc = {row["pair"]: row["p"] for row in result["posthoc"]}
+    assert posthoc.keys() == POSTHOC_DUNN[p_adjust].keys()
+    for pair, expected in POSTHOC_DUNN[p_adjust].items():
+        np.testing.assert_allclose(posthoc[pair], expected, rtol=1e-10)
+
+    # rank_tests gives the same post-hoc from its batched ranking
+    values = np.concatenate([np.asarray(v) for v in GROUPS.values()])[:, None]
+    codes = np.repeat(np.arange(len(GROUPS)), [len(v) for v in GROUPS.values()])
+    (batched,) = rank_tests(values, codes, list(GROUPS), p_adjust=p_adjust)
+    assert batched["posthoc"] == result["posthoc"]
+
+
+@pytest.mark.parametrize("method", ["bonferroni", "holm"])
+def test_adjust_pvalues_matches_statsmodels(method):
+    p = np.array([0.01, 0.04, 0.03, 0.2, 0.04, 0.5])
+    np.testing.assert_allclose(
+        _adjust_pvalues(p, method), multipletests(p, method=method)[1], rtol=1e-12
+    )
@@ -0,0 +1,212 @@
+"""Resampling engine against SciPy references and brute-force loops."""
+
+import numpy as np
+import polars as pl
+import pytest
+from scipy import stats
+
+from src.fairness.metrics import (
+    bootstrap_ci,
+    bootstrap_cis,
+    fairness_gap,
+    permutation_test,
+    permutation_tests,
+)
+from src.fairness.resampling import (
+    bootstrap_batches,
+    encode_outcomes,
+    group_rates,
+    group_scores,
+    hypergeometric_support,
+    jackknife_statistics,
+    permutation_null,
+    resample_statistics,
+    stratum_blocks,
+)
+
+STATISTICS = ("dir", "dpd", "best_rate", "worst_rate", "group_rates")
+
+
+def _frame(n: int = 150, seed: int = 0) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    group = rng.choice(["a", "b", "c"], n)
+    score = rng.random(n) * np.select([group == "a", group == "b"], [0.9, 1.0], 0.8)
+    # Two-exam patients, so clusters differ from cases
+    return pl.DataFrame({"score": score, "group": group, "patient": np.arange(n) // 2})
+
+
+def _outcomes(df: pl.DataFrame, threshold: float = 0.5):
+    return encode_outcomes(group_scores(df, "score", "group", "patient"), threshold, True)
+
+
+def test_group_rates_match_per_group_means():
+    outcomes = _outcomes(_frame())
+    indices = np.random.default_rng(1).integers(0, outcomes.n, (20, outcomes.n))
+
+    rates = group_rates(outcomes, indices)
+    for row, idx in zip(rates, indices):
+        codes, success = outcomes.codes[idx], outcomes.success[idx]
+        expected = [success[codes == g].mean() for g in range(outcomes.n_groups)]
+        np.testing.assert_allclose(row, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("statistic", ["dir", "dpd", "worst_rate"])
+def test_bca_matches_scipy_bootstrap(statistic):
+    df = _frame()
+    outcomes = _outcomes(df)
+
+    def fn(idx, axis=-1):
+        return resample_statistics(outcomes, idx.astype(np.intp), (statistic,))[statistic]
+
+    ref = stats.bootstrap(
+        (np.arange(outcomes.n),), fn, vectorized=True, n_resamples=2_000,
+        method="BCa", rng=np.random.default_rng(7),
+    ).confidence_interval
+    ours = bootstrap_cis(df, "score", "group", (statistic,), threshold=0.5, n_boot=2_000, seed=7)
+
+    assert ours[statistic]["method"] == "bca"
+    np.testing.assert_allclose(
+        [ours[statistic]["ci_low"], ours[statistic]["ci_high"]], [ref.low, ref.high], rtol=1e-12
+    )
+
+
+def test_permutation_null_matches_shuffle_loop():
+    outcomes = _outcomes(_frame())
+    null = permutation_null(outcomes, STATISTICS, 500, np.random.default_rng(3), batch=64)
+
+    # Former loop: one rng.permutation of the group labels per shuffle
+    rng = np.random.default_rng(3)
+    for k in range(500):
+        codes = outcomes.codes[rng.permutation(outcomes.n)]
+        rates = np.array([outcomes.success[codes == g].mean() for g in range(len(outcomes.groups))])
+        assert null["dpd"][k] == pytest.approx(rates.max() - rates.min(), rel=1e-12)
+        assert null["dir"][k] == pytest.approx(rates.min() / rates.max(), rel=1e-12)
+        for group, rate in zip(outcomes.groups, rates):
+            assert null[f"rate_{group}"][k] == pytest.approx(rate, rel=1e-12)
+
+
+def test_exact_support_matches_multivariate_hypergeom():
+    sizes = np.array([6, 9, 4])
+    counts, prob = hypergeometric_support(sizes, 8)
+
+    assert (counts.sum(axis=1) == 8).all()
+    assert len({tuple(c) for c in counts}) == len(counts)
+    np.testing.assert_allclose(prob.sum(), 1.0, rtol=1e-12)
+    np.testing.assert_allclose(
+        prob, stats.multivariate_hypergeom.pmf(counts, m=sizes, n=8), rtol=1e-10
+    )
+
+
+def test_exact_p_value_matches_large_monte_carlo():
+    df = _frame(n=60)
+    exact = permutation_tests(df, "score", "group", ("dpd",), threshold=0.5)["dpd"]
+    mc = permutation_tests(
+        df, "score", "group", ("dpd",), threshold=0.5, n_perm=40_000, seed=0, exact=False
+    )["dpd"]
+
+    assert exact["method"] == "exact"
+    assert abs(exact["p_value"] - mc["p_value"]) < 0.01
+    np.testing.assert_allclose(exact["null_mean"], mc["null_mean"], atol=2e-3)
+
+
+@pytest.mark.parametrize("scheme", ["case", "cluster"])
+def test_jackknife_matches_leave_one_out(scheme):
+    outcomes = _outcomes(_frame(n=61))
+    jackknife = jackknife_statistics(outcomes, STATISTICS, scheme=scheme)
+
+    units = outcomes.clusters if scheme == "cluster" else np.arange(outcomes.n)
+    brute = [
+        resample_statistics(outcomes, np.flatnonzero(units != u), STATISTICS)
+        for u in np.unique(units)
+    ]
+    for name, values in jackknife.items():
+        np.testing.assert_allclose(values, [row[name] for row in brute], rtol=1e-12)
+
+
+def test_stratified_resamples_keep_group_sizes():
+    df = _frame()
+    df = df.with_columns(group=pl.Series(["rare"] * 2 + df["group"].to_list()[2:]))
+    outcomes = _outcomes(df)
+    sizes = np.bincount(outcomes.codes)
+
+    order, offsets, slot_sizes = stratum_blocks(outcomes)
+    draws = np.random.default_rng(0).integers(0, slot_sizes, (200, outcomes.n))
+    for idx in order[offsets + draws]:
+        np.testing.assert_array_equal(np.bincount(outcomes.codes[idx], minlength=sizes.size), sizes)
+
+    rare = np.concatenate([
+        values["rate_rare"]
+        for values in bootstrap_batches(
+            outcomes, ("group_rates",), 2_000, np.random.default_rng(0), scheme="stratified"
+        )
+    ])
+    assert not np.isnan(rare).any()
+
+
+def test_singleton_clusters_match_case_bootstrap():
+    # Zero-padded ids keep cluster codes in case order, so both draw the same cases
+    df = _frame()
+    df = df.with_columns(patient=pl.Series([f"p{i:04d}" for i in range(df.height)]))
+    case = bootstrap_cis(df, "score", "group", STATISTICS, threshold=0.5, n_boot=1_000, seed=2)
+    cluster = bootstrap_cis(
+        df, "score", "group", STATISTICS, threshold=0.5, n_boot=1_000, seed=2,
+        resample="cluster", cluster_col="patient",
+    )
+    for name in case:
+        np.testing.assert_allclose(
+            [cluster[name]["ci_low"], cluster[name]["ci_high"]],
+            [case[name]["ci_low"], case[name]["ci_high"]],
+            rtol=1e-12,
+        )
+
+
+def test_sequential_bootstrap_is_a_prefix_within_tol_of_fixed():
+    df = _frame(n=228)
+    kwargs = {"threshold": 0.5, "seed": 5, "batch": 500}
+    seq = bootstrap_cis(
+        df, "score", "group", ("dir", "dpd"), n_boot=10_000, sequential=True, tol=0.005, **kwargs
+    )
+    used = seq["dir"]["n_boot"]
+    assert seq["dir"]["stopping"] == "ci_stable"
+    assert used < 10_000
+
+    prefix = bootstrap_cis(df, "score", "group", ("dir", "dpd"), n_boot=used, **kwargs)
+    full = bootstrap_cis(df, "score", "group", ("dir", "dpd"), n_boot=10_000, **kwargs)
+    for name in ("dir", "dpd"):
+        ends = [seq[name]["ci_low"], seq[name]["ci_high"]]
+        np.testing.assert_allclose(ends, [prefix[name]["ci_low"], prefix[name]["ci_high"]])
+        np.testing.assert_allclose(
+            ends, [full[name]["ci_low"], full[name]["ci_high"]], atol=0.005
+        )
+
+
+def test_sequential_permutation_agrees_with_fixed_decision():
+    df = _frame(n=200)
+    kwargs = {"threshold": 0.5, "seed": 1, "exact": False, "n_perm": 5_000}
+    seq = permutation_tests(df, "score", "group", ("dir", "dpd"), sequential=True, **kwargs)
+    fixed = permutation_tests(df, "score", "group", ("dir", "dpd"), **kwargs)
+    for name in ("dir", "dpd"):
+        assert seq[name]["n_perm"] <= fixed[name]["n_perm"]
+        assert (seq[name]["p_value"] < 0.05) == (fixed[name]["p_value"] < 0.05)
+
+
+
+def test_metric_fn_callable_matches_named_statistic():
+    # Former signature: a metric_fn(df, score_col, group_col) callable
+    df = _frame(n=90)
+
+    def metric_fn(d, score_col, group_col):
+        return fairness_gap(d, score_col, group_col, threshold=0.5)["dir"]
+
+    ci = bootstrap_ci(df, "score", "group", metric_fn, n_boot=500, seed=4)
+    native = bootstrap_ci(df, "score", "group", "dir", threshold=0.5, n_boot=500, seed=4)
+    for key in ("point_estimate", "ci_low", "ci_high"):
+        np.testing.assert_allclose(ci[key], native[key], rtol=1e-12)
+
+    perm = permutation_test(df, "score", "group", metric_fn, n_perm=300, seed=4)
+    native = permutation_test(
+        df, "score", "group", "dir", threshold=0.5, n_perm=300, seed=4, exact=False
+    )
+    np.testing.assert_allclose(perm["observed"], native["observed"], rtol=1e-12)
+    assert 0.0 <= perm["p_value"] <= 1.0
+    assert perm["method"] == "monte_carlo"
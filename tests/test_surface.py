@@ -0,0 +1,133 @@
+"""Cropped boundary metrics and Dice match the full-volume computation."""
+
+import numpy as np
+import pytest
+
+from src.fairness import LABELS
+from src.fairness.evaluate import dice_coefficient
+from src.fairness.surface import (
+    BOUNDARY_METRICS,
+    _weighted_percentile,
+    _weighted_percentile_sorted,
+    boundary_metrics,
+    label_bboxes,
+    label_boundary_metrics,
+    union_bbox,
+)
+
+SPACING = (0.6, 0.6, 3.3)
+
+
+def _ball(shape: tuple[int, ...], centre: tuple[int, ...], radius: float) -> np.ndarray:
+    grid = np.ogrid[tuple(slice(0, n) for n in shape)]
+    return sum((g - c) ** 2 for g, c in zip(grid, centre)) < radius**2
+
+
+def _volumes(case: str) -> tuple[np.ndarray, np.ndarray]:
+    """(pred, ref) label volumes for one synthetic scenario."""
+    shape = (40, 36, 18)
+    rng = np.random.default_rng(0)
+    ref = np.zeros(shape, dtype=np.uint8)
+    ref[_ball(shape, (14, 18, 9), 8)] = 1
+    ref[_ball(shape, (28, 16, 8), 5)] = 2
+    pred = np.roll(ref, (2, -1, 1), axis=(0, 1, 2))
+    noise = rng.random(shape) < 0.01
+    pred[noise] = rng.integers(0, 3, noise.sum())
+
+    if case == "border":
+        # Both labels run off every face of the volume.
+        ref[:, :, :3] = 1
+        ref[:2] = 2
+        pred[:, :, -2:] = 1
+        pred[:, -3:] = 2
+    elif case == "pred_empty":
+        pred[pred == 2] = 0
+    elif case == "ref_empty":
+        ref[ref == 1] = 0
+    elif case == "both_empty":
+        pred[pred == 2] = 0
+        ref[ref == 2] = 0
+    elif case == "single_voxel":
+        pred[pred == 1] = 0
+        pred[0, 0, 0] = 1
+    return pred, ref
+
+
+CASES = ["interior", "border", "pred_empty", "ref_empty", "both_empty", "single_voxel"]
+
+
+@pytest.mark.parametrize("case", CASES)
+@pytest.mark.parametrize("label", list(LABELS))
+def test_cropped_boundary_metrics_match_full_volume(case, label):
+    pred, ref = _volumes(case)
+    full = boundary_metrics(pred == label, ref == label, SPACING)
+
+    cropped = label_boundary_metrics(pred, ref, label, SPACING)
+    pred_bbox = label_bboxes(pred, max(LABELS))[label - 1]
+    ref_bbox = label_bboxes(ref, max(LABELS))[label - 1]
+    precomputed = label_boundary_metrics(
+        pred, ref, label, SPACING, pred_bbox=pred_bbox, ref_bbox=ref_bbox
+    )
+
+    for metric in BOUNDARY_METRICS:
+        np.testing.assert_allclose(cropped[metric], full[metric], rtol=1e-12)
+        np.testing.assert_allclose(precomputed[metric], full[metric], rtol=1e-12)
+
+
+@pytest.mark.parametrize("case", CASES)
+@pytest.mark.parametrize("label", list(LABELS))
+def test_cropped_dice_matches_full_volume(case, label):
+    pred, ref = _volumes(case)
+    pred_mask, ref_mask = pred == label, ref == label
+    total = pred_mask.sum() + ref_mask.sum()
+    expected = 2.0 * (pred_mask & ref_mask).sum() / total if total else float("nan")
+
+    full = dice_coefficient(pred, ref, label)
+    np.testing.assert_allclose(full, expected, rtol=1e-12)
+
+    boxes = [label_bboxes(v, label)[label - 1] for v in (pred, ref)]
+    if any(box is not None for box in boxes):
+        crop = union_bbox(*boxes, ref.shape)
+        np.testing.assert_allclose(dice_coefficient(pred[crop], ref[crop], label), full)
+
+
+def test_empty_mask_conventions():
+    pred, ref = _volumes("pred_empty")
+    one_empty = label_boundary_metrics(pred, ref, 2, SPACING)
+    assert one_empty["hd95"] == one_empty["hd100"] == one_empty["assd"] == float("inf")
+    assert one_empty["nsd"] == 0.0
+    assert dice_coefficient(pred, ref, 2) == 0.0
+
+    pred, ref = _volumes("both_empty")
+    both_empty = label_boundary_metrics(pred, ref, 2, SPACING)
+    assert all(np.isnan(both_empty[metric]) for metric in BOUNDARY_METRICS)
+    assert np.isnan(dice_coefficient(pred, ref, 2))
+
+
+@pytest.mark.parametrize("case", ["interior", "border", "single_voxel"])
+@pytest.mark.parametrize("label", list(LABELS))
+def test_matches_surface_distance_package(case, label):
+    """HD95 in earlier evaluation CSVs came from DeepMind's surface-distance."""
+    sd = pytest.importorskip("surface_distance")
+    pred, ref = _volumes(case)
+    distances = sd.compute_surface_distances(ref == label, pred == label, SPACING)
+    ours = label_boundary_metrics(pred, ref, label, SPACING)
+
+    assert ours["hd95"] == sd.compute_robust_hausdorff(distances, 95.0)
+    np.testing.assert_allclose(
+        ours["nsd"], sd.compute_surface_dice_at_tolerance(distances, 2.0), rtol=1e-12
+    )
+
+
+@pytest.mark.parametrize("n", [50, 5_000, 60_000])
+@pytest.mark.parametrize("q", [5.0, 50.0, 95.0, 100.0])
+def test_weighted_selection_matches_sorted_cumsum(n, q):
+    rng = np.random.default_rng(n)
+    # Few distinct distances and surfel areas, as on real voxel surfaces
+    tied = np.sqrt(rng.integers(0, 400, n).astype(float))
+    areas = rng.choice([0.09, 0.18, 0.25, 0.36 * np.sqrt(2)], n)
+    uniform = np.full(n, 0.36)
+    for values, weights in [(tied, areas), (tied, uniform), (rng.gamma(2.0, 1.0, n), areas)]:
+        assert _weighted_percentile(values, weights, q) == _weighted_percentile_sorted(
+            values, weights, q
+        )